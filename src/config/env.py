@@ -1,35 +1,57 @@
 """Load and validate environment variables. Single source for env handling."""
+import json
 import os
-import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 from dotenv import load_dotenv
 
-# Load .env from project root (parent of src/)
+# Project root (parent of src/); .env is loaded lazily by load_env()
 _root = Path(__file__).resolve().parent.parent.parent
-load_dotenv(_root / ".env")
+_loaded = False
+_UNPROBED = object()
+_secrets = _UNPROBED  # Streamlit secrets mapping, None when unavailable; probed once
+
+
+def _get_secrets():
+    """Return Streamlit secrets if present (probed once per process), else None."""
+    global _secrets
+    if _secrets is _UNPROBED:
+        try:
+            import streamlit as st
+            _secrets = st.secrets if hasattr(st, "secrets") and st.secrets else None
+        except Exception:
+            _secrets = None
+    return _secrets
 
 
 def _get(key: str, default: str = "") -> str:
     """Get config: Streamlit secrets (deployed) then env vars (local)."""
-    try:
-        import streamlit as st
-        if hasattr(st, "secrets") and st.secrets and key in st.secrets:
-            return str(st.secrets.get(key, default))
-    except Exception:
-        pass
+    secrets = _get_secrets()
+    if secrets is not None:
+        try:
+            if key in secrets:
+                return str(secrets.get(key, default))
+        except Exception:
+            pass
     return os.getenv(key, default)
 
 
 def load_env() -> None:
-    """Ensure .env is loaded. Call at app startup."""
-    load_dotenv(_root / ".env")
+    """Ensure .env is loaded (once per process). Call at app startup."""
+    global _loaded
+    if not _loaded:
+        load_dotenv(_root / ".env")
+        _loaded = True
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> "Settings":
-    """Return validated settings. Uses Streamlit secrets when deployed, else env / .env."""
+    """Return validated settings (built once, then cached). Uses Streamlit secrets when deployed, else env / .env."""
     from src.config.settings import Settings
 
+    load_env()
+
     # Google credentials: path, or JSON content (Streamlit Cloud: use GOOGLE_SERVICE_ACCOUNT_KEY secret)
     raw_path = (
         _get("GOOGLE_SERVICE_ACCOUNT_KEY")
@@ -37,26 +59,17 @@ def get_settings() -> "Settings":
         or _get("GOOGLE_APPLICATION_CREDENTIALS", "")
     )
     google_credentials_path = ""
+    google_credentials_json = ""
     if raw_path:
+        # Inline key JSON is parsed once and kept in memory (no temp file) as one canonical string,
+        # which is what the MCP adapters key their cached credentials on; else treat as a path
         if isinstance(raw_path, dict):
-            import json
-            try:
-                fd, path = tempfile.mkstemp(suffix=".json")
-                with os.fdopen(fd, "w") as f:
-                    json.dump(raw_path, f)
-                google_credentials_path = path
-            except Exception:
-                pass
+            google_credentials_json = json.dumps(dict(raw_path), sort_keys=True)
         else:
             raw_path = str(raw_path).strip()
             if raw_path.startswith("{") and "client_email" in raw_path:
                 try:
-                    import json
-                    json.loads(raw_path)
-                    fd, path = tempfile.mkstemp(suffix=".json")
-                    with os.fdopen(fd, "w") as f:
-                        f.write(raw_path)
-                    google_credentials_path = path
+                    google_credentials_json = json.dumps(json.loads(raw_path), sort_keys=True)
                 except Exception:
                     pass
             else:
@@ -70,6 +83,7 @@ def get_settings() -> "Settings":
     return Settings(
         groq_api_key=_get("GROQ_API_KEY", ""),
         google_credentials_path=google_credentials_path or "",
+        google_credentials_json=google_credentials_json,
         google_calendar_id=_get("GOOGLE_CALENDAR_ID", "primary"),
         google_sheet_id=_get("GOOGLE_SHEET_ID", ""),
         advisor_email=advisor_email,
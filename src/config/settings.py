@@ -1,5 +1,15 @@
-"""Pydantic settings and app constants."""
-from pydantic import BaseModel, Field
+"""Settings and app constants."""
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # optional; keyword matching falls back to one containment test per keyword
+    ahocorasick = None
+
+# Slotted dataclasses (no per-instance __dict__) where supported; slots= needs Python 3.10+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 # Topic taxonomy (5 advisory categories)
 TOPICS = {
@@ -19,6 +29,55 @@ INTENTS = {
     "availability": ["when available", "free slots", "open times", "availability"],
 }
 
+
+class KeywordIndex(NamedTuple):
+    """Flattened keyword table plus an optional Aho-Corasick automaton over the same keywords."""
+
+    entries: Tuple[Tuple[str, Tuple[Tuple[str, str], ...]], ...]  # (lowercase keyword, ((taxonomy, category), ...))
+    automaton: Any = None  # ahocorasick.Automaton mapping keyword -> position in entries
+
+
+def build_keyword_index(taxonomies: Dict[str, Dict[str, List[str]]]) -> KeywordIndex:
+    """
+    Flatten {taxonomy: {category: [keywords]}} into one keyword table.
+    Keywords are lowercased once and shared across categories, so each is searched for once per utterance.
+    With pyahocorasick installed, all keywords are also compiled into one automaton (a single pass per utterance).
+    """
+    owners: Dict[str, List[Tuple[str, str]]] = {}
+    for taxonomy, categories in taxonomies.items():
+        for category, keywords in categories.items():
+            for kw in keywords:
+                owners.setdefault(kw.lower(), []).append((taxonomy, category))
+    entries = tuple((kw, tuple(pairs)) for kw, pairs in owners.items())
+    automaton = None
+    if ahocorasick is not None and entries:
+        automaton = ahocorasick.Automaton()
+        for i, (kw, _) in enumerate(entries):
+            automaton.add_word(kw, i)
+        automaton.make_automaton()
+    return KeywordIndex(entries, automaton)
+
+
+def match_keywords(lowered: str, index: KeywordIndex) -> List[Tuple[str, str]]:
+    """
+    Return (taxonomy, category) once per keyword of that category found in the lowercased text.
+    Substring semantics are kept, so overlapping keywords (e.g. "schedule" in "reschedule") all count.
+    """
+    hits: List[Tuple[str, str]] = []
+    if index.automaton is not None:
+        # The automaton reports every (overlapping) occurrence; count each keyword once
+        for i in {i for _, i in index.automaton.iter(lowered)}:
+            hits.extend(index.entries[i][1])
+        return hits
+    for kw, pairs in index.entries:
+        if kw in lowered:
+            hits.extend(pairs)
+    return hits
+
+
+# Topics and intents in one table: a single scan of an utterance serves both taxonomies
+TAXONOMY_INDEX = build_keyword_index({"topic": TOPICS, "intent": INTENTS})
+
 DISCLAIMER = (
     "This is for informational purposes only and does not constitute investment advice. "
     "Please consult a qualified advisor for decisions."
@@ -28,17 +87,20 @@ BOOKING_DURATION_MINUTES = 30
 BOOKING_CODE_PREFIX = "NL"
 
 
-class Settings(BaseModel):
-    groq_api_key: str = Field(default="", description="Groq API key for LLM")
-    google_credentials_path: str = Field(default="", description="Path to Google service account JSON")
-    google_calendar_id: str = Field(default="primary", description="Google Calendar ID")
-    google_sheet_id: str = Field(default="", description="Google Sheet ID for pre-bookings")
-    advisor_email: str = Field(default="", description="Advisor email for drafts")
-    base_url: str = Field(default="https://example.com", description="Base URL for secure links")
-    timezone: str = Field(default="Asia/Kolkata", description="Display timezone (IST)")
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class Settings:
+    groq_api_key: str = ""  # Groq API key for LLM
+    google_credentials_path: str = ""  # Path to Google service account JSON
+    # Inline service account key (e.g. Streamlit secrets), serialized once with sorted keys; never shown in repr
+    google_credentials_json: str = field(default="", repr=False)
+    google_calendar_id: str = "primary"  # Google Calendar ID
+    google_sheet_id: str = ""  # Google Sheet ID for pre-bookings
+    advisor_email: str = ""  # Advisor email for drafts
+    base_url: str = "https://example.com"  # Base URL for secure links
+    timezone: str = "Asia/Kolkata"  # Display timezone (IST)
 
     def groq_configured(self) -> bool:
         return bool(self.groq_api_key.strip())
 
     def google_configured(self) -> bool:
-        return bool(self.google_credentials_path.strip())
+        return bool(self.google_credentials_json) or bool(self.google_credentials_path.strip())
@@ -0,0 +1,38 @@
+"""Booking-code normalization and parsing shared by the MCP adapters and the conversation engine."""
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from src.config.settings import BOOKING_CODE_PREFIX
+
+_CODE_PREFIX = f"{BOOKING_CODE_PREFIX}-"
+# Spoken/typed separators allowed between any two characters of a code
+_SEP = r"[\s\-_.]*"
+# A code inside user input, tolerating case and separators: "nl-a742", "NL A 742", "code is NLA742", "N L P 7 6 0"
+_CODE_IN_TEXT_RE = re.compile(
+    rf"\b{_SEP.join(map(re.escape, BOOKING_CODE_PREFIX))}{_SEP}([A-Z]){_SEP}([1-9]){_SEP}([0-9]){_SEP}([0-9])\b",
+    re.ASCII | re.IGNORECASE,
+)
+# Everything except ASCII letters and digits; applied after upper(), so one ASCII class suffices
+_NON_ALNUM_RE = re.compile(r"[^A-Z0-9]+", re.ASCII)
+
+
+def normalize_booking_code(code: str) -> str:
+    """Normalize for matching so 'NLP 760', 'NL-P760', 'nl p760' all become 'NLP760' (e.g. voice transcription)."""
+    if not code:
+        return ""
+    return _NON_ALNUM_RE.sub("", code.upper())
+
+
+def parse_booking_code(text: str) -> Optional[str]:
+    """
+    Return the canonical code (e.g. 'NL-A742') found in user input, or None if there isn't one.
+    Also canonicalizes stored or normalized forms ('NLA742', 'nl a 742').
+    """
+    match = _CODE_IN_TEXT_RE.search(text)
+    if match is None:
+        return None
+    letter, *digits = match.groups()
+    return f"{_CODE_PREFIX}{letter.upper()}{''.join(digits)}"
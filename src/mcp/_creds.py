@@ -0,0 +1,49 @@
+"""Shared service-account credential loading for the MCP adapters (cached per process)."""
+
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.mcp import _gapi
+
+
+@lru_cache(maxsize=8)
+def _load_credentials(credentials_path: str, scopes: Tuple[str, ...], subject_email: Optional[str] = None):
+    """Read and parse the service-account key once per (path, scopes, subject)."""
+    creds = _gapi.service_account.Credentials.from_service_account_file(credentials_path, scopes=list(scopes))
+    if subject_email:
+        creds = creds.with_subject(subject_email)
+    return creds
+
+
+@lru_cache(maxsize=8)
+def _load_credentials_json(credentials_json: str, scopes: Tuple[str, ...], subject_email: Optional[str] = None):
+    """Build credentials from in-memory key JSON (e.g. Streamlit secrets) once per (key, scopes, subject)."""
+    info = json.loads(credentials_json)
+    creds = _gapi.service_account.Credentials.from_service_account_info(info, scopes=list(scopes))
+    if subject_email:
+        creds = creds.with_subject(subject_email)
+    return creds
+
+
+def get_credentials(
+    credentials_path: str,
+    scopes: Tuple[str, ...],
+    subject_email: Optional[str] = None,
+    credentials_json: Optional[str] = None,
+):
+    """
+    Return cached service-account credentials, or None if neither key JSON nor key file is available.
+    In-memory key JSON (credentials_json, as carried on Settings) takes precedence over credentials_path.
+    """
+    if credentials_json:
+        return _load_credentials_json(credentials_json, tuple(scopes), subject_email)
+    if not credentials_path or not Path(credentials_path).exists():
+        return None
+    return _load_credentials(credentials_path, tuple(scopes), subject_email)
+
+
+__all__ = ["get_credentials"]
@@ -0,0 +1,39 @@
+"""Lazily imported Google client symbols shared by the MCP adapters (PEP 562 module __getattr__).
+
+Importing this module is free; the first access to e.g. `_gapi.build` imports the
+underlying library once and caches the symbol as a module global, so later lookups
+are plain attribute reads instead of per-call import statements.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+
+class _HttpErrorUnavailable(Exception):
+    """Stand-in for googleapiclient's HttpError when the client library is not installed (never raised)."""
+
+
+def _load_http_error():
+    try:
+        return importlib.import_module("googleapiclient.errors").HttpError
+    except ImportError:
+        return _HttpErrorUnavailable
+
+
+_LOADERS = {
+    "build": lambda: importlib.import_module("googleapiclient.discovery").build,
+    "HttpError": _load_http_error,
+    "service_account": lambda: importlib.import_module("google.oauth2.service_account"),
+    "AuthorizedHttp": lambda: importlib.import_module("google_auth_httplib2").AuthorizedHttp,
+    "Http": lambda: importlib.import_module("httplib2").Http,
+}
+
+
+def __getattr__(name: str):
+    loader = _LOADERS.get(name)
+    if loader is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = loader()
+    globals()[name] = value
+    return value
@@ -0,0 +1,49 @@
+"""Shared Google API service objects for the MCP adapters.
+
+Each (api, version, credentials) service keeps its own authorized HTTP connection alive,
+so repeated calendar/sheets/gmail calls skip the discovery parse and TLS handshake.
+httplib2 connections are not thread-safe and calls arrive from both the MCP executor and
+Streamlit script threads (a fresh one per rerun), so services live in a lock-protected
+pool: a caller borrows one for the duration of its requests and hands it back.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterator, List, Tuple
+
+from src.mcp import _gapi
+
+# Idle services kept per key; enough for the MCP executor plus a script thread
+_MAX_IDLE_PER_KEY = 6
+
+_pool_lock = threading.Lock()
+_idle: Dict[Tuple[str, str, Hashable], List[object]] = {}
+
+
+def _build_service(api: str, version: str, credentials):
+    http = _gapi.AuthorizedHttp(credentials, http=_gapi.Http())
+    # Bundled discovery documents: no network fetch, so nothing to cache either
+    return _gapi.build(api, version, http=http, static_discovery=True, cache_discovery=False)
+
+
+@contextmanager
+def borrow_service(api: str, version: str, credentials) -> Iterator:
+    """Lend a googleapiclient service no other thread is using, building one if the pool is empty."""
+    key = (api, version, credentials)
+    with _pool_lock:
+        idle = _idle.get(key)
+        service = idle.pop() if idle else None
+    if service is None:
+        service = _build_service(api, version, credentials)
+    try:
+        yield service
+    finally:
+        with _pool_lock:
+            idle = _idle.setdefault(key, [])
+            if len(idle) < _MAX_IDLE_PER_KEY:
+                idle.append(service)
+
+
+__all__ = ["borrow_service"]
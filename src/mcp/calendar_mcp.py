@@ -3,18 +3,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from pathlib import Path
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 from typing import List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 from src.config.settings import BOOKING_DURATION_MINUTES
+from src.mcp._booking_code import normalize_booking_code, parse_booking_code
+from src.mcp._creds import get_credentials
+from src.mcp._service import borrow_service
 
 # Scopes: events (create holds) + readonly (freebusy query)
-_CALENDAR_SCOPES = [
+_CALENDAR_SCOPES = (
     "https://www.googleapis.com/auth/calendar.events",
     "https://www.googleapis.com/auth/calendar.readonly",
-]
+)
 
 
 @dataclass
@@ -24,13 +26,8 @@ class SlotInfo:
     timezone: str
 
 
-def _get_credentials(credentials_path: str):
-    if not credentials_path or not Path(credentials_path).exists():
-        return None
-    from google.oauth2 import service_account
-    return service_account.Credentials.from_service_account_file(
-        credentials_path, scopes=_CALENDAR_SCOPES
-    )
+def _get_credentials(credentials_path: str, credentials_json: Optional[str] = None):
+    return get_credentials(credentials_path, _CALENDAR_SCOPES, credentials_json=credentials_json)
 
 
 def _normalize_time(hh_mm: str) -> str:
@@ -47,14 +44,26 @@ def _normalize_time(hh_mm: str) -> str:
 
 def _slot_to_start_end_rfc3339(slot: SlotInfo, duration_minutes: int = BOOKING_DURATION_MINUTES):
     """Return (start_str, end_str) in RFC 3339 with explicit offset (e.g. +05:30) so Calendar API shows correct local time."""
-    time_norm = _normalize_time(slot.time)
-    naive = datetime.strptime(f"{slot.date} {time_norm}", "%Y-%m-%d %H:%M")
-    tz = ZoneInfo(slot.timezone)
-    start_dt = naive.replace(tzinfo=tz)
+    day = date.fromisoformat(slot.date)
+    hour, minute = (int(part) for part in _normalize_time(slot.time).split(":"))
+    # ZoneInfo caches instances per key, so constructing it per call is a dict lookup
+    start_dt = datetime(day.year, day.month, day.day, hour, minute, tzinfo=ZoneInfo(slot.timezone))
     end_dt = start_dt + timedelta(minutes=duration_minutes)
     return start_dt.isoformat(), end_dt.isoformat()
 
 
+def _merge_busy_ranges(busy_ranges: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
+    """Sort busy (start, end) ranges and merge overlapping/adjacent ones, so both starts and ends ascend."""
+    merged: List[Tuple[datetime, datetime]] = []
+    for start, end in sorted(busy_ranges):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
 def get_available_slots(
     calendar_id: str,
     credentials_path: str,
@@ -64,19 +73,19 @@ def get_available_slots(
     start_hour: int = 9,
     end_hour: int = 17,
     weekdays: Tuple[int, ...] = (1, 2, 3, 4, 5),  # Tue=1 .. Sat=5 (Python weekday)
+    credentials_json: Optional[str] = None,
 ) -> List[SlotInfo]:
     """
     Query your Google Calendar free/busy and return slots that are free.
     Slots are on the given weekdays (default Tue–Sat), between start_hour and end_hour, in 30‑min steps.
     Returns empty list on error (e.g. no credentials or API failure).
     """
-    if not credentials_path or not calendar_id or not Path(credentials_path).exists():
+    if not (credentials_path or credentials_json) or not calendar_id:
         return []
-    creds = _get_credentials(credentials_path)
+    creds = _get_credentials(credentials_path, credentials_json)
     if not creds:
         return []
     try:
-        from googleapiclient.discovery import build
         tz = ZoneInfo(timezone)
         now = datetime.now(tz)
         # Query from now; end after days_ahead
@@ -87,8 +96,8 @@ def get_available_slots(
             "timeMax": time_max.isoformat(),
             "items": [{"id": calendar_id}],
         }
-        service = build("calendar", "v3", credentials=creds)
-        result = service.freebusy().query(body=body).execute()
+        with borrow_service("calendar", "v3", creds) as service:
+            result = service.freebusy().query(body=body).execute()
         busy_list = []
         for cal_id, cal_data in result.get("calendars", {}).items():
             busy_list.extend(cal_data.get("busy", []))
@@ -103,47 +112,47 @@ def get_available_slots(
                 start_dt = parse_iso(start_s).astimezone(tz)
                 end_dt = parse_iso(end_s).astimezone(tz)
                 busy_ranges.append((start_dt, end_dt))
-        # Candidate slots: every slot_duration_minutes from start_hour to end_hour on weekdays
+        busy_ranges = _merge_busy_ranges(busy_ranges)
+        # Candidate slots: every slot_duration_minutes from start_hour to end_hour on weekdays.
+        # Slots are generated in ascending time order, so a single pointer sweeps the merged busy ranges.
         slots_out: List[SlotInfo] = []
         start_date = time_min.date()
         end_date = time_max.date()
+        # Minute-of-day offsets and their "HH:MM" labels are the same every day; build them once
+        day_offsets = [
+            (timedelta(minutes=hour * 60 + minute), f"{hour:02d}:{minute:02d}")
+            for hour in range(start_hour, end_hour)
+            for minute in (0, 30)
+        ]
+        duration = timedelta(minutes=slot_duration_minutes)
+        busy_idx = 0
         day = start_date
         while day <= end_date:
             if day.weekday() in weekdays:
-                for hour in range(start_hour, end_hour):
-                    for minute in (0, 30):
-                        slot_start = datetime(day.year, day.month, day.day, hour, minute, 0, tzinfo=tz)
-                        slot_end = slot_start + timedelta(minutes=slot_duration_minutes)
-                        if slot_start < now:
-                            continue
-                        # Skip if overlaps any busy period
-                        overlaps = any(
-                            slot_start < be and bs < slot_end
-                            for bs, be in busy_ranges
-                        )
-                        if not overlaps:
-                            slots_out.append(SlotInfo(
-                                date=day.strftime("%Y-%m-%d"),
-                                time=slot_start.strftime("%H:%M"),
-                                timezone=timezone,
-                            ))
+                day_start = datetime(day.year, day.month, day.day, tzinfo=tz)
+                date_str = day.isoformat()
+                for offset, time_str in day_offsets:
+                    slot_start = day_start + offset
+                    if slot_start < now:
+                        continue
+                    slot_end = slot_start + duration
+                    # Drop busy ranges that ended before this slot; only the next one can overlap
+                    while busy_idx < len(busy_ranges) and busy_ranges[busy_idx][1] <= slot_start:
+                        busy_idx += 1
+                    overlaps = busy_idx < len(busy_ranges) and busy_ranges[busy_idx][0] < slot_end
+                    if not overlaps:
+                        slots_out.append(SlotInfo(date=date_str, time=time_str, timezone=timezone))
             day += timedelta(days=1)
         return slots_out
     except Exception:
         return []
 
 
-def _normalize_booking_code_for_lookup(code: str) -> str:
-    """Normalize so 'NLP 760', 'NL-P760', 'NL P760' all match (e.g. voice transcription)."""
-    if not code:
-        return ""
-    return "".join(c for c in code.strip().upper() if c.isalnum())
-
-
 def find_event_by_booking_code(
     calendar_id: str,
     credentials_path: str,
     code: str,
+    credentials_json: Optional[str] = None,
 ) -> Optional[str]:
     """
     Find a calendar event whose summary contains the booking code (e.g. " — NL-V779").
@@ -151,41 +160,51 @@ def find_event_by_booking_code(
     Code is normalized so "NLP 760" / "NL-P760" match (voice transcription).
     Returns event_id if found, None otherwise. Searches now-90d to now+365d.
     """
-    if not credentials_path or not calendar_id or not code or not Path(credentials_path).exists():
+    if not (credentials_path or credentials_json) or not calendar_id or not code:
         return None
-    creds = _get_credentials(credentials_path)
+    creds = _get_credentials(credentials_path, credentials_json)
     if not creds:
         return None
-    code_norm = _normalize_booking_code_for_lookup(code)
+    code_norm = normalize_booking_code(code)
     if not code_norm:
         return None
+    code_stripped = code.strip()
     try:
-        from googleapiclient.discovery import build
-        tz = ZoneInfo("UTC")
-        now = datetime.now(tz)
+        now = datetime.now(dt_timezone.utc)
         time_min = (now - timedelta(days=90)).isoformat()
         time_max = (now + timedelta(days=365)).isoformat()
-        service = build("calendar", "v3", credentials=creds)
-        request = service.events().list(
-            calendarId=calendar_id,
-            timeMin=time_min,
-            timeMax=time_max,
-            singleEvents=True,
-            orderBy="startTime",
-        )
-        while request is not None:
-            response = request.execute()
-            for event in response.get("items", []):
-                summary = (event.get("summary") or "")
-                # Direct match (e.g. "NL-P760" in summary)
-                if code.strip() in summary:
-                    return event.get("id")
-                # Normalized match: event title ends with " — {Code}", normalize and compare
-                if " — " in summary:
-                    event_code = summary.rsplit(" — ", 1)[-1].strip()
-                    if _normalize_booking_code_for_lookup(event_code) == code_norm:
-                        return event.get("id")
-            request = service.events().list_next(request, response)
+        with borrow_service("calendar", "v3", creds) as service:
+            # Let Calendar's full-text search (q=) narrow the listing to the canonical code first;
+            # fall back to scanning the whole window for spellings the search does not match.
+            canonical = parse_booking_code(code_norm)
+            for query in ([canonical] if canonical else []) + [None]:
+                list_kwargs = dict(
+                    calendarId=calendar_id,
+                    timeMin=time_min,
+                    timeMax=time_max,
+                    singleEvents=True,
+                    orderBy="startTime",
+                    # Only id/summary are inspected; skip the rest of each event's payload
+                    fields="items(id,summary),nextPageToken",
+                )
+                if query:
+                    # A searched code matches one event (or a few), so a small first page suffices
+                    list_kwargs["q"] = query
+                    list_kwargs["maxResults"] = 50
+                request = service.events().list(**list_kwargs)
+                while request is not None:
+                    response = request.execute()
+                    for event in response.get("items", []):
+                        summary = (event.get("summary") or "")
+                        # Direct match (e.g. "NL-P760" in summary)
+                        if code_stripped in summary:
+                            return event.get("id")
+                        # Normalized match: event title ends with " — {Code}", normalize and compare
+                        if " — " in summary:
+                            event_code = summary.rsplit(" — ", 1)[-1].strip()
+                            if normalize_booking_code(event_code) == code_norm:
+                                return event.get("id")
+                    request = service.events().list_next(request, response)
         return None
     except Exception:
         return None
@@ -196,29 +215,29 @@ def update_event_to_slot(
     credentials_path: str,
     event_id: str,
     slot: SlotInfo,
+    credentials_json: Optional[str] = None,
 ) -> tuple[bool, str]:
     """
     Update an existing calendar event's start/end to the given slot (for reschedule).
     Returns (success, message).
     """
-    if not credentials_path or not calendar_id or not event_id:
+    if not (credentials_path or credentials_json) or not calendar_id or not event_id:
         return False, "Calendar update skipped (missing calendar ID, credentials, or event ID)"
-    creds = _get_credentials(credentials_path)
+    creds = _get_credentials(credentials_path, credentials_json)
     if not creds:
         return False, "Calendar update skipped (credentials file not found)"
     try:
-        from googleapiclient.discovery import build
         start_str, end_str = _slot_to_start_end_rfc3339(slot)
         body = {
             "start": {"dateTime": start_str, "timeZone": slot.timezone},
             "end": {"dateTime": end_str, "timeZone": slot.timezone},
         }
-        service = build("calendar", "v3", credentials=creds)
-        service.events().patch(
-            calendarId=calendar_id,
-            eventId=event_id,
-            body=body,
-        ).execute()
+        with borrow_service("calendar", "v3", creds) as service:
+            service.events().patch(
+                calendarId=calendar_id,
+                eventId=event_id,
+                body=body,
+            ).execute()
         return True, "Calendar event rescheduled"
     except Exception as e:
         return False, f"Calendar update error: {e}"
@@ -228,22 +247,22 @@ def delete_event_by_id(
     calendar_id: str,
     credentials_path: str,
     event_id: str,
+    credentials_json: Optional[str] = None,
 ) -> tuple[bool, str]:
     """
     Delete a calendar event (for cancel). Returns (success, message).
     """
-    if not credentials_path or not calendar_id or not event_id:
+    if not (credentials_path or credentials_json) or not calendar_id or not event_id:
         return False, "Calendar delete skipped (missing calendar ID, credentials, or event ID)"
-    creds = _get_credentials(credentials_path)
+    creds = _get_credentials(credentials_path, credentials_json)
     if not creds:
         return False, "Calendar delete skipped (credentials file not found)"
     try:
-        from googleapiclient.discovery import build
-        service = build("calendar", "v3", credentials=creds)
-        service.events().delete(
-            calendarId=calendar_id,
-            eventId=event_id,
-        ).execute()
+        with borrow_service("calendar", "v3", creds) as service:
+            service.events().delete(
+                calendarId=calendar_id,
+                eventId=event_id,
+            ).execute()
         return True, "Calendar event cancelled (deleted)"
     except Exception as e:
         return False, f"Calendar delete error: {e}"
@@ -255,6 +274,7 @@ def create_tentative_hold(
     slot: SlotInfo,
     calendar_id: str,
     credentials_path: str,
+    credentials_json: Optional[str] = None,
 ) -> tuple[bool, str]:
     """
     Create a tentative calendar event: "Advisor Q&A — {Topic} — {Code}".
@@ -262,13 +282,12 @@ def create_tentative_hold(
     If the event appears at 4:30 AM instead of 10 AM, set your Google Calendar view timezone to Asia/Kolkata.
     Returns (success, message).
     """
-    if not credentials_path or not calendar_id:
+    if not (credentials_path or credentials_json) or not calendar_id:
         return True, "Calendar skipped (no credentials or calendar ID)"
-    creds = _get_credentials(credentials_path)
+    creds = _get_credentials(credentials_path, credentials_json)
     if not creds:
         return True, "Calendar skipped (credentials file not found)"
     try:
-        from googleapiclient.discovery import build
         start_str, end_str = _slot_to_start_end_rfc3339(slot)
         title = f"Advisor Q&A — {topic} — {booking_code}"
         body = {
@@ -278,8 +297,8 @@ def create_tentative_hold(
             "end": {"dateTime": end_str, "timeZone": slot.timezone},
             "status": "tentative",
         }
-        service = build("calendar", "v3", credentials=creds)
-        service.events().insert(calendarId=calendar_id, body=body).execute()
+        with borrow_service("calendar", "v3", creds) as service:
+            service.events().insert(calendarId=calendar_id, body=body).execute()
         return True, "Calendar hold created"
     except Exception as e:
         return False, f"Calendar error: {e}"
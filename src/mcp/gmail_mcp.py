@@ -3,20 +3,51 @@
 from __future__ import annotations
 
 import base64
+from email.header import Header
 from email.mime.text import MIMEText
-from pathlib import Path
 from typing import Optional
 
+from src.mcp import _gapi
+from src.mcp._creds import get_credentials
+from src.mcp._service import borrow_service
 
-def _get_credentials(credentials_path: str, subject_email: Optional[str] = None):
-    if not credentials_path or not Path(credentials_path).exists():
-        return None
-    from google.oauth2 import service_account
-    SCOPES = ["https://www.googleapis.com/auth/gmail.compose"]
-    creds = service_account.Credentials.from_service_account_file(credentials_path, scopes=SCOPES)
-    if subject_email:
-        creds = creds.with_subject(subject_email)
-    return creds
+_GMAIL_SCOPES = ("https://www.googleapis.com/auth/gmail.compose",)
+
+
+def _get_credentials(
+    credentials_path: str,
+    subject_email: Optional[str] = None,
+    credentials_json: Optional[str] = None,
+):
+    return get_credentials(
+        credentials_path, _GMAIL_SCOPES, subject_email=subject_email, credentials_json=credentials_json
+    )
+
+
+def _build_raw_message(to: str, subject: str, body: str) -> bytes:
+    """
+    Serialize a single-part text/plain message directly, skipping the email generator.
+    Matches what MIMEText produces; falls back to it when header values are not plain single-line ASCII.
+    """
+    if not to.isascii() or any(c in to or c in subject for c in "\r\n"):
+        msg = MIMEText(body)
+        msg["to"] = to
+        msg["subject"] = subject
+        return msg.as_bytes()
+    subject_header = subject if subject.isascii() else Header(subject, "utf-8", header_name="subject").encode()
+    if body.isascii():
+        charset, encoding, payload = "us-ascii", "7bit", body
+    else:
+        charset, encoding = "utf-8", "base64"
+        payload = base64.encodebytes(body.encode("utf-8")).decode("ascii")
+    return (
+        f'Content-Type: text/plain; charset="{charset}"\n'
+        "MIME-Version: 1.0\n"
+        f"Content-Transfer-Encoding: {encoding}\n"
+        f"to: {to}\n"
+        f"subject: {subject_header}\n\n"
+        f"{payload}"
+    ).encode("ascii")
 
 
 def create_draft_advisor_email(
@@ -26,20 +57,20 @@ def create_draft_advisor_email(
     topic: str,
     slot_label: str,
     from_email: Optional[str] = None,
+    credentials_json: Optional[str] = None,
 ) -> tuple[bool, str]:
     """
     Create a Gmail draft to the advisor with booking details (approval-gated; not sent).
     If using a service account, set from_email to the delegated user (e.g. advisor or a shared inbox).
+    credentials_json (the service-account key as a JSON string) can be passed instead of credentials_path.
     Returns (success, message).
     """
-    if not advisor_email or not credentials_path:
+    if not advisor_email or not (credentials_path or credentials_json):
         return True, "Gmail draft skipped (no advisor email or credentials)"
-    creds = _get_credentials(credentials_path, subject_email=from_email)
+    creds = _get_credentials(credentials_path, subject_email=from_email, credentials_json=credentials_json)
     if not creds:
         return True, "Gmail draft skipped (credentials file not found)"
     try:
-        from googleapiclient.discovery import build
-        from googleapiclient.errors import HttpError
         body_text = (
             f"Advisor pre-booking (tentative hold).\n\n"
             f"Booking code: {booking_code}\n"
@@ -47,14 +78,12 @@ def create_draft_advisor_email(
             f"Slot: {slot_label}\n\n"
             "Please review and confirm. Do not share PII in reply."
         )
-        msg = MIMEText(body_text)
-        msg["to"] = advisor_email
-        msg["subject"] = f"Advisor Pre-Booking — {booking_code} — {topic}"
-        raw = base64.urlsafe_b64encode(msg.as_bytes()).decode()
-        service = build("gmail", "v1", credentials=creds)
-        service.users().drafts().create(userId="me", body={"message": {"raw": raw}}).execute()
+        subject = f"Advisor Pre-Booking — {booking_code} — {topic}"
+        raw = base64.urlsafe_b64encode(_build_raw_message(advisor_email, subject, body_text)).decode()
+        with borrow_service("gmail", "v1", creds) as service:
+            service.users().drafts().create(userId="me", body={"message": {"raw": raw}}).execute()
         return True, "Advisor email draft created"
-    except HttpError as e:
+    except _gapi.HttpError as e:
         if e.resp.status == 400 or (getattr(e, "error_details", None) and "failedPrecondition" in str(e.error_details)):
             return True, (
                 "Gmail draft skipped (service account cannot create drafts; "
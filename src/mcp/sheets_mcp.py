@@ -2,30 +2,154 @@
 
 from __future__ import annotations
 
+import re
+import threading
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+from src.mcp import _gapi
+from src.mcp._booking_code import normalize_booking_code
+from src.mcp._creds import get_credentials
+from src.mcp._service import borrow_service
 
-def _get_credentials(credentials_path: str):
-    if not credentials_path or not Path(credentials_path).exists():
-        return None
-    from google.oauth2 import service_account
-    SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
-    return service_account.Credentials.from_service_account_file(credentials_path, scopes=SCOPES)
+_SHEETS_SCOPES = ("https://www.googleapis.com/auth/spreadsheets",)
+
+
+def _get_credentials(credentials_path: str, credentials_json: Optional[str] = None):
+    return get_credentials(credentials_path, _SHEETS_SCOPES, credentials_json=credentials_json)
 
 
 # Columns: A=timestamp, B=booking_code, C=topic, D=slot_label, E=status, F=source
 _BOOKING_CODE_COL = 1  # 0-based
 _SLOT_LABEL_COL = 3
 _STATUS_COL = 4
+# Row number at the start of an A1 range, e.g. "Sheet1!A15:F15" -> 15
+_RANGE_ROW_RE = re.compile(r"[A-Z]+(\d+)")
+
+# Developer-metadata key tagging each appended row with its normalized booking code
+_BOOKING_CODE_METADATA_KEY = "booking_code"
+
+# Process-local index: (sheet_id, normalized booking code) -> 1-based row number
+_row_index: Dict[Tuple[str, str], int] = {}
+# Process-local map: (sheet_id, tab title) -> numeric tab id (needed to anchor row metadata)
+_tab_ids: Dict[Tuple[str, str], int] = {}
+# Both maps are written from the MCP executor and Streamlit script threads
+_index_lock = threading.Lock()
+
+
+def _index_booking_codes(service, sheet_id: str) -> None:
+    """Rebuild the row index for this sheet from column B only (first row with a code wins)."""
+    result = service.spreadsheets().values().get(
+        spreadsheetId=sheet_id,
+        range="B:B",
+        majorDimension="COLUMNS",
+    ).execute()
+    columns = result.get("values") or []
+    fresh: Dict[Tuple[str, str], int] = {}
+    for row_number, cell in enumerate(columns[0] if columns else [], start=1):
+        code_norm = normalize_booking_code(cell)
+        if code_norm:
+            fresh.setdefault((sheet_id, code_norm), row_number)
+    with _index_lock:
+        for key in [k for k in _row_index if k[0] == sheet_id]:
+            del _row_index[key]
+        _row_index.update(fresh)
+
+
+def _find_booking_row(service, sheet_id: str, booking_code: str) -> Optional[int]:
+    """
+    Return the 1-based row whose column B matches booking_code (normalized), or None.
+    Uses the cached index, then the row's booking-code developer metadata (each checked against
+    its single column-B cell), and finally rebuilds the index from column B.
+    """
+    code_norm = normalize_booking_code(booking_code)
+    with _index_lock:
+        cached = _row_index.get((sheet_id, code_norm))
+    # Rows can be edited or deleted by hand; confirm the cached row still holds this code
+    if cached is not None and _row_holds_code(service, sheet_id, cached, code_norm):
+        return cached
+    for row in _search_booking_row_metadata(service, sheet_id, code_norm):
+        # Tags can outlive edits or sit on another tab; only trust one whose cell (where updates write) agrees
+        if _row_holds_code(service, sheet_id, row, code_norm):
+            with _index_lock:
+                _row_index[(sheet_id, code_norm)] = row
+            return row
+    # Rows logged before metadata tagging (or tagged by hand) are only findable by their cell value
+    _index_booking_codes(service, sheet_id)
+    with _index_lock:
+        return _row_index.get((sheet_id, code_norm))
+
+
+def _row_holds_code(service, sheet_id: str, row: int, code_norm: str) -> bool:
+    """Whether column B of this 1-based row (first tab, like the updates) holds the normalized code."""
+    result = service.spreadsheets().values().get(
+        spreadsheetId=sheet_id,
+        range=f"B{row}",
+    ).execute()
+    values = result.get("values") or []
+    return bool(values and values[0]) and normalize_booking_code(values[0][0]) == code_norm
+
 
+def _search_booking_row_metadata(service, sheet_id: str, code_norm: str) -> List[int]:
+    """Ask Sheets for the rows tagged with this booking code (metadata follows row moves); 1-based, ascending."""
+    response = service.spreadsheets().developerMetadata().search(
+        spreadsheetId=sheet_id,
+        body={
+            "dataFilters": [{
+                "developerMetadataLookup": {
+                    "metadataKey": _BOOKING_CODE_METADATA_KEY,
+                    "metadataValue": code_norm,
+                },
+            }],
+        },
+    ).execute()
+    rows = [
+        match["developerMetadata"]["location"]["dimensionRange"]["startIndex"] + 1
+        for match in response.get("matchedDeveloperMetadata") or []
+        if "dimensionRange" in match.get("developerMetadata", {}).get("location", {})
+    ]
+    return sorted(set(rows))
 
-def _normalize_booking_code(code: str) -> str:
-    """Normalize for matching (e.g. 'NLP 760' / 'NL-P760' -> 'NLP760')."""
-    if not code:
-        return ""
-    return "".join(c for c in (code or "").strip().upper() if c.isalnum())
+
+def _tag_booking_row(service, sheet_id: str, tab_title: str, row: int, code_norm: str) -> None:
+    """Attach booking-code developer metadata to an appended row so lookups can skip the sheet scan."""
+    key = (sheet_id, tab_title)
+    with _index_lock:
+        tab_id = _tab_ids.get(key)
+    if tab_id is None:
+        spreadsheet = service.spreadsheets().get(
+            spreadsheetId=sheet_id,
+            fields="sheets.properties(sheetId,title)",
+        ).execute()
+        fetched: Dict[Tuple[str, str], int] = {}
+        for tab in spreadsheet.get("sheets") or []:
+            props = tab.get("properties") or {}
+            fetched[(sheet_id, props.get("title", ""))] = props.get("sheetId", 0)
+        with _index_lock:
+            _tab_ids.update(fetched)
+        tab_id = fetched.get(key)
+        if tab_id is None:
+            return  # Unknown tab: an untagged row is still found via column B; a mis-anchored tag would not be
+    service.spreadsheets().batchUpdate(
+        spreadsheetId=sheet_id,
+        body={"requests": [{
+            "createDeveloperMetadata": {
+                "developerMetadata": {
+                    "metadataKey": _BOOKING_CODE_METADATA_KEY,
+                    "metadataValue": code_norm,
+                    "location": {
+                        "dimensionRange": {
+                            "sheetId": tab_id,
+                            "dimension": "ROWS",
+                            "startIndex": row - 1,
+                            "endIndex": row,
+                        },
+                    },
+                    "visibility": "DOCUMENT",
+                },
+            },
+        }]},
+    ).execute()
 
 
 def update_prebooking_row_for_reschedule(
@@ -34,48 +158,34 @@ def update_prebooking_row_for_reschedule(
     booking_code: str,
     new_slot_label: str,
     new_status: str = "rescheduled",
+    credentials_json: Optional[str] = None,
 ) -> tuple[bool, str]:
     """
     Find the row with this booking_code (column B) and update slot_label (D) and status (E).
     So the same row shows the new slot and "rescheduled" instead of leaving the old row and appending a new one.
     Returns (success, message). If no row is found, returns (False, "Booking code not found in sheet").
     """
-    if not sheet_id or not credentials_path or not booking_code:
+    if not sheet_id or not (credentials_path or credentials_json) or not booking_code:
         return True, "Sheets skipped (no sheet ID, credentials, or booking code)"
-    creds = _get_credentials(credentials_path)
+    creds = _get_credentials(credentials_path, credentials_json)
     if not creds:
         return True, "Sheets skipped (credentials file not found)"
     try:
-        from googleapiclient.discovery import build
-        from googleapiclient.errors import HttpError
-        service = build("sheets", "v4", credentials=creds)
-        # Read first sheet, columns A–F
-        result = service.spreadsheets().values().get(
-            spreadsheetId=sheet_id,
-            range="A:F",
-        ).execute()
-        rows = result.get("values") or []
-        # Find row index (0-based) where column B matches booking_code
-        row_index: Optional[int] = None
-        code_norm = _normalize_booking_code(booking_code)
-        for i, row in enumerate(rows):
-            if len(row) > _BOOKING_CODE_COL and _normalize_booking_code(row[_BOOKING_CODE_COL]) == code_norm:
-                row_index = i
-                break
-        if row_index is None:
-            return False, "Booking code not found in sheet (no row to update)"
-        # Update row: D = new_slot_label, E = new_status (1-based row = row_index + 1)
-        one_based = row_index + 1
-        range_str = f"D{one_based}:E{one_based}"
-        body = {"values": [[new_slot_label, new_status]]}
-        service.spreadsheets().values().update(
-            spreadsheetId=sheet_id,
-            range=range_str,
-            valueInputOption="USER_ENTERED",
-            body=body,
-        ).execute()
-        return True, "Existing sheet row updated to new slot (rescheduled)"
-    except HttpError as e:
+        with borrow_service("sheets", "v4", creds) as service:
+            one_based = _find_booking_row(service, sheet_id, booking_code)
+            if one_based is None:
+                return False, "Booking code not found in sheet (no row to update)"
+            # Update row: D = new_slot_label, E = new_status
+            range_str = f"D{one_based}:E{one_based}"
+            body = {"values": [[new_slot_label, new_status]]}
+            service.spreadsheets().values().update(
+                spreadsheetId=sheet_id,
+                range=range_str,
+                valueInputOption="USER_ENTERED",
+                body=body,
+            ).execute()
+            return True, "Existing sheet row updated to new slot (rescheduled)"
+    except _gapi.HttpError as e:
         if e.resp.status == 403:
             return False, (
                 "Sheets 403: The caller does not have permission. "
@@ -91,44 +201,32 @@ def update_prebooking_row_status(
     credentials_path: str,
     booking_code: str,
     new_status: str,
+    credentials_json: Optional[str] = None,
 ) -> tuple[bool, str]:
     """
     Find the row with this booking_code (column B, normalized match) and update status (column E).
     Used for cancel: set status to "cancelled". Returns (success, message).
     """
-    if not sheet_id or not credentials_path or not booking_code:
+    if not sheet_id or not (credentials_path or credentials_json) or not booking_code:
         return True, "Sheets skipped (no sheet ID, credentials, or booking code)"
-    creds = _get_credentials(credentials_path)
+    creds = _get_credentials(credentials_path, credentials_json)
     if not creds:
         return True, "Sheets skipped (credentials file not found)"
     try:
-        from googleapiclient.discovery import build
-        from googleapiclient.errors import HttpError
-        service = build("sheets", "v4", credentials=creds)
-        result = service.spreadsheets().values().get(
-            spreadsheetId=sheet_id,
-            range="A:F",
-        ).execute()
-        rows = result.get("values") or []
-        row_index: Optional[int] = None
-        code_norm = _normalize_booking_code(booking_code)
-        for i, row in enumerate(rows):
-            if len(row) > _BOOKING_CODE_COL and _normalize_booking_code(row[_BOOKING_CODE_COL]) == code_norm:
-                row_index = i
-                break
-        if row_index is None:
-            return False, "Booking code not found in sheet"
-        one_based = row_index + 1
-        range_str = f"E{one_based}"
-        body = {"values": [[new_status]]}
-        service.spreadsheets().values().update(
-            spreadsheetId=sheet_id,
-            range=range_str,
-            valueInputOption="USER_ENTERED",
-            body=body,
-        ).execute()
-        return True, "Sheet row status updated to " + new_status
-    except HttpError as e:
+        with borrow_service("sheets", "v4", creds) as service:
+            one_based = _find_booking_row(service, sheet_id, booking_code)
+            if one_based is None:
+                return False, "Booking code not found in sheet"
+            range_str = f"E{one_based}"
+            body = {"values": [[new_status]]}
+            service.spreadsheets().values().update(
+                spreadsheetId=sheet_id,
+                range=range_str,
+                valueInputOption="USER_ENTERED",
+                body=body,
+            ).execute()
+            return True, "Sheet row status updated to " + new_status
+    except _gapi.HttpError as e:
         if e.resp.status == 403:
             return False, (
                 "Sheets 403: The caller does not have permission. "
@@ -147,32 +245,44 @@ def append_prebooking_row(
     slot_label: str,
     status: str = "tentative",
     source: str = "voice_agent",
+    credentials_json: Optional[str] = None,
 ) -> tuple[bool, str]:
     """
     Append a row to the Advisor Pre-Bookings sheet.
     Columns: timestamp, booking_code, topic, slot, status, source.
     Returns (success, message).
     """
-    if not sheet_id or not credentials_path:
+    if not sheet_id or not (credentials_path or credentials_json):
         return True, "Sheets skipped (no sheet ID or credentials)"
-    creds = _get_credentials(credentials_path)
+    creds = _get_credentials(credentials_path, credentials_json)
     if not creds:
         return True, "Sheets skipped (credentials file not found)"
     try:
-        from googleapiclient.discovery import build
-        from googleapiclient.errors import HttpError
         ts = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
         values: List[List[str]] = [[ts, booking_code, topic, slot_label, status, source]]
-        service = build("sheets", "v4", credentials=creds)
-        service.spreadsheets().values().append(
-            spreadsheetId=sheet_id,
-            range="A:F",
-            valueInputOption="USER_ENTERED",
-            insertDataOption="INSERT_ROWS",
-            body={"values": values},
-        ).execute()
-        return True, "Pre-booking logged to sheet"
-    except HttpError as e:
+        with borrow_service("sheets", "v4", creds) as service:
+            response = service.spreadsheets().values().append(
+                spreadsheetId=sheet_id,
+                range="A:F",
+                valueInputOption="USER_ENTERED",
+                insertDataOption="INSERT_ROWS",
+                body={"values": values},
+            ).execute()
+            # Remember where the row landed (and tag it) so later reschedule/cancel updates skip the lookup
+            updated_range = (response.get("updates") or {}).get("updatedRange") or ""
+            tab_title, _, cells = updated_range.rpartition("!")
+            row_match = _RANGE_ROW_RE.match(cells)
+            code_norm = normalize_booking_code(booking_code)
+            if row_match and code_norm:
+                row = int(row_match.group(1))
+                with _index_lock:
+                    _row_index.setdefault((sheet_id, code_norm), row)
+                try:
+                    _tag_booking_row(service, sheet_id, tab_title.strip("'").replace("''", "'"), row, code_norm)
+                except Exception:
+                    pass  # Tagging is an optimization; the row is logged and still findable via column B
+            return True, "Pre-booking logged to sheet"
+    except _gapi.HttpError as e:
         if e.resp.status == 403:
             return False, (
                 "Sheets 403: The caller does not have permission. "
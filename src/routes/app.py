@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-import base64
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Ensure project root is on path when running: streamlit run src/routes/app.py
@@ -13,7 +13,12 @@ if str(_root) not in sys.path:
 
 import streamlit as st
 
-from src.config import get_settings, load_env
+try:
+    import xxhash
+except ImportError:  # optional; recordings are then keyed with the built-in hash
+    xxhash = None
+
+from src.config import Settings, get_settings
 from src.services.actions import (
     MCPResult,
     on_booking_complete,
@@ -26,7 +31,7 @@ from src.services.conversation_engine import (
     ConversationState,
 )
 from src.voice.stt import transcribe_audio
-from src.voice.tts import text_to_speech_mp3
+from src.voice.tts import text_to_speech_mp3, text_to_speech_mp3_sentences
 
 
 CHAT_KEY = "chat_history"
@@ -35,6 +40,18 @@ MCP_RUN_FOR_KEY = "mcp_run_for_booking_code"
 MCP_RESULT_KEY = "mcp_result"
 LAST_VOICE_HASH_KEY = "last_processed_voice_hash"
 AGENT_REPLY_TO_SPEAK_KEY = "agent_reply_to_speak"  # when set, show TTS for this reply (voice-in → voice-out)
+LAST_AGENT_TEXT_KEY = "last_agent_text"  # newest agent message, kept in step with CHAT_KEY
+REPLY_CLIPS_FUTURE_KEY = "agent_reply_clips_future"  # TTS for AGENT_REPLY_TO_SPEAK_KEY, started before the rerun
+PENDING_VOICE_KEYS = ("pending_voice_text", "pending_voice_hash")
+# Everything "Start over" clears: conversation, Phase 2 MCP state, and voice state
+RESET_KEYS = frozenset((
+    CHAT_KEY, SESSION_KEY, MCP_RUN_FOR_KEY, MCP_RESULT_KEY,
+    LAST_VOICE_HASH_KEY, AGENT_REPLY_TO_SPEAK_KEY, LAST_AGENT_TEXT_KEY, REPLY_CLIPS_FUTURE_KEY,
+    "voice_recorder_turn", *PENDING_VOICE_KEYS,
+))
+
+# Voice replies are synthesized here while MCP calls and the rerun round-trip are still in flight
+_tts_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tts")
 
 
 def _init_session(timezone_label: str) -> ConversationSession:
@@ -48,9 +65,80 @@ def _init_history() -> None:
         st.session_state[CHAT_KEY] = []  # list[tuple[role, text]]
 
 
+def _append_agent_message(text: str) -> None:
+    st.session_state[CHAT_KEY].append(("agent", text))
+    st.session_state[LAST_AGENT_TEXT_KEY] = text
+
+
+def _audio_key(audio_bytes: bytes | memoryview) -> int:
+    """Within-session dedup key for a recording: xxh3 (SIMD, much faster on large WAVs) when available."""
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(audio_bytes)
+    return hash(bytes(audio_bytes))
+
+
+class _TranscriptionFailed(Exception):
+    """Raised inside the cached STT helper so a failed transcription is not cached (re-recording retries)."""
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_transcript(voice_hash: int, _audio_bytes: bytes | memoryview) -> str:
+    text = transcribe_audio(_audio_bytes)
+    if text is None:
+        raise _TranscriptionFailed
+    return text
+
+
+def _transcribe(voice_hash: int, audio_bytes: bytes | memoryview) -> str | None:
+    """STT keyed by the recording's hash (the audio itself is not hashed by Streamlit); None on failure."""
+    try:
+        return _cached_transcript(voice_hash, audio_bytes)
+    except _TranscriptionFailed:
+        return None
+
+
+def _dispatch_mcp(
+    state_before: ConversationState, turn: AgentTurn, session: ConversationSession, settings: Settings
+) -> None:
+    """Phase 2: run MCP when the turn just completed a booking, reschedule, or cancel; store the result."""
+    if turn.state != ConversationState.BOOKING_COMPLETE:
+        return
+    ctx = session.context
+    code = ctx.existing_booking_code
+    if state_before == ConversationState.CANCEL_CONFIRM and code:
+        st.session_state[MCP_RESULT_KEY] = on_cancel_complete(ctx, settings)
+        st.session_state[MCP_RUN_FOR_KEY] = f"cancel:{code}"
+        return
+    chosen = ctx.chosen_slot_index
+    if state_before != ConversationState.CONFIRMATION or chosen is None or len(ctx.offered_slots) <= chosen:
+        return
+    intent = ctx.intent
+    # Reschedule: update existing calendar event and sheet row; never create a new booking.
+    if intent == "reschedule" and code:
+        mcp_result = on_reschedule_complete(ctx, settings)
+        st.session_state[MCP_RUN_FOR_KEY] = f"reschedule:{code}"
+    elif intent != "reschedule":
+        # New booking only when intent is book_new (avoid creating duplicate when reschedule intent was lost)
+        mcp_result = on_booking_complete(ctx, settings)
+        st.session_state[MCP_RUN_FOR_KEY] = ctx.booking_code or ""
+    else:
+        mcp_result = MCPResult()
+    st.session_state[MCP_RESULT_KEY] = mcp_result
+
+
+@st.fragment
+def _render_listen_button(last_agent: str) -> None:
+    """Fragment: clicking Listen reruns only this block, not the chat, recorder and form."""
+    if st.button("Listen to agent's last message", type="secondary"):
+        audio_bytes = text_to_speech_mp3(last_agent)
+        if audio_bytes:
+            st.audio(audio_bytes, format="audio/mp3")
+        else:
+            st.caption("Could not generate audio.")
+
+
 def main() -> None:
-    load_env()
-    settings = get_settings()
+    settings = get_settings()  # process-wide cached; loads .env on first call
 
     st.set_page_config(page_title="Advisor Appointment Voice Agent", page_icon="💬")
     st.title("Advisor Appointment Voice Agent")
@@ -62,13 +150,8 @@ def main() -> None:
 
     # Start over: clear conversation and Phase 2 MCP state
     if st.button("Start over", type="secondary"):
-        for key in (
-            CHAT_KEY, SESSION_KEY, MCP_RUN_FOR_KEY, MCP_RESULT_KEY,
-            LAST_VOICE_HASH_KEY, AGENT_REPLY_TO_SPEAK_KEY,
-            "voice_recorder_turn", "pending_voice_text", "pending_voice_hash",
-        ):
-            if key in st.session_state:
-                del st.session_state[key]
+        for key in RESET_KEYS:
+            st.session_state.pop(key, None)
         st.rerun()
 
     # Initialize state
@@ -79,14 +162,18 @@ def main() -> None:
     if not st.session_state[CHAT_KEY]:
         with st.spinner("Agent is starting…"):
             first_turn: AgentTurn = session.step("")
-            st.session_state[CHAT_KEY].append(("agent", first_turn.text))
+            _append_agent_message(first_turn.text)
 
-    # Chat history
-    for role, text in st.session_state[CHAT_KEY]:
-        if role == "user":
-            st.markdown(f"**You:** {text}")
-        else:
-            st.markdown(f"**Agent:** {text}")
+    # Chat history: one markdown element for the whole transcript instead of one per message.
+    # Markdown (not escaped HTML) because agent replies use bold and bullet lists; blank lines
+    # between messages close any list or emphasis so nothing bleeds into the next message.
+    if st.session_state[CHAT_KEY]:
+        st.markdown(
+            "\n\n".join(
+                f"**You:** {text}" if role == "user" else f"**Agent:** {text}"
+                for role, text in st.session_state[CHAT_KEY]
+            )
+        )
 
     # Voice: listen to last agent response (TTS)
     # When input was via voice, show agent reply as text (above) + voice (here): voice-in → text and voice out
@@ -95,26 +182,21 @@ def main() -> None:
         st.markdown("---")
         st.markdown("🔊 **Agent reply (audio)** — *you spoke by voice, so here is the reply in voice too*")
         with st.spinner("Generating speech…"):
-            audio_bytes = text_to_speech_mp3(agent_reply_to_speak)
-        if audio_bytes:
-            # One player: controls + autoplay (browsers may block autoplay until interaction)
-            b64 = base64.b64encode(audio_bytes).decode()
-            st.markdown(
-                f'<audio src="data:audio/mp3;base64,{b64}" controls autoplay></audio>',
-                unsafe_allow_html=True,
-            )
+            # Sentences are synthesized in parallel and played back to back; usually already
+            # started on the previous run, right after the agent produced the reply
+            clips_future = st.session_state.pop(REPLY_CLIPS_FUTURE_KEY, None)
+            clips = clips_future.result() if clips_future else text_to_speech_mp3_sentences(agent_reply_to_speak)
+        if clips:
+            # MP3 is frame-based, so sentence clips concatenate into one playable file (gTTS joins its
+            # own request chunks the same way); served through Streamlit's media endpoint, no base64.
+            st.audio(b"".join(clips), format="audio/mp3", autoplay=True)
         else:
             st.caption("Could not generate audio. Use *Listen to agent's last message* below to retry.")
         del st.session_state[AGENT_REPLY_TO_SPEAK_KEY]
-    elif st.session_state[CHAT_KEY]:
-        last_agent = next((t for r, t in reversed(st.session_state[CHAT_KEY]) if r == "agent"), None)
+    else:
+        last_agent = st.session_state.get(LAST_AGENT_TEXT_KEY)
         if last_agent:
-            if st.button("Listen to agent's last message", type="secondary"):
-                audio_bytes = text_to_speech_mp3(last_agent)
-                if audio_bytes:
-                    st.audio(audio_bytes, format="audio/mp3")
-                else:
-                    st.caption("Could not generate audio.")
+            _render_listen_button(last_agent)
 
     # Pending voice confirmation: "You said: ..." with [Send] [Retry]
     pending_voice_text = st.session_state.get("pending_voice_text")
@@ -129,46 +211,21 @@ def main() -> None:
                     st.session_state[CHAT_KEY].append(("user", pending_voice_text))
                     state_before = session.state
                     turn = session.step(pending_voice_text)
-                    st.session_state[CHAT_KEY].append(("agent", turn.text))
-                    just_confirmed = (
-                        state_before == ConversationState.CONFIRMATION
-                        and turn.state == ConversationState.BOOKING_COMPLETE
-                    )
-                    just_cancelled = (
-                        state_before == ConversationState.CANCEL_CONFIRM
-                        and turn.state == ConversationState.BOOKING_COMPLETE
-                        and session.context.existing_booking_code
+                    _append_agent_message(turn.text)
+                    st.session_state[REPLY_CLIPS_FUTURE_KEY] = _tts_executor.submit(
+                        text_to_speech_mp3_sentences, turn.text
                     )
-                    has_slot = (
-                        session.context.chosen_slot_index is not None
-                        and len(session.context.offered_slots) > session.context.chosen_slot_index
-                    )
-                    if just_cancelled:
-                        mcp_result = on_cancel_complete(session.context, settings)
-                        st.session_state[MCP_RUN_FOR_KEY] = f"cancel:{session.context.existing_booking_code}"
-                        st.session_state[MCP_RESULT_KEY] = mcp_result
-                    elif just_confirmed and has_slot:
-                        if session.context.intent == "reschedule" and session.context.existing_booking_code:
-                            mcp_result = on_reschedule_complete(session.context, settings)
-                            st.session_state[MCP_RUN_FOR_KEY] = f"reschedule:{session.context.existing_booking_code}"
-                        elif session.context.intent != "reschedule":
-                            mcp_result = on_booking_complete(session.context, settings)
-                            st.session_state[MCP_RUN_FOR_KEY] = session.context.booking_code or ""
-                        else:
-                            mcp_result = MCPResult()
-                        st.session_state[MCP_RESULT_KEY] = mcp_result
-                    for k in ("pending_voice_text", "pending_voice_hash"):
-                        if k in st.session_state:
-                            del st.session_state[k]
+                    _dispatch_mcp(state_before, turn, session, settings)
+                    for k in PENDING_VOICE_KEYS:
+                        st.session_state.pop(k, None)
                     st.session_state["voice_recorder_turn"] = st.session_state.get("voice_recorder_turn", 0) + 1
                     # Voice-in → voice-out: show agent reply as text (in chat) and play as TTS on next run
                     st.session_state[AGENT_REPLY_TO_SPEAK_KEY] = turn.text
                 st.rerun()
         with col_retry:
             if st.button("Retry", type="secondary", key="voice_confirm_retry"):
-                for k in ("pending_voice_text", "pending_voice_hash"):
-                    if k in st.session_state:
-                        del st.session_state[k]
+                for k in PENDING_VOICE_KEYS:
+                    st.session_state.pop(k, None)
                 st.session_state["voice_recorder_turn"] = st.session_state.get("voice_recorder_turn", 0) + 1
                 st.rerun()
 
@@ -179,11 +236,12 @@ def main() -> None:
     st.markdown("**Reply by voice or text**")
     voice_audio = st.audio_input("Record your answer (or type below)", key=f"voice_input_{voice_recorder_turn}")
     if voice_audio and not pending_voice_text:
-        audio_bytes = voice_audio.read()
-        voice_hash = hash(audio_bytes) if audio_bytes else None
+        # Zero-copy view of the upload buffer; hashed and handed to STT without a bytes copy
+        audio_bytes = voice_audio.getbuffer()
+        voice_hash = _audio_key(audio_bytes) if audio_bytes else None
         if voice_hash and st.session_state.get(LAST_VOICE_HASH_KEY) != voice_hash:
             with st.spinner("Transcribing..."):
-                voice_text = transcribe_audio(audio_bytes) if audio_bytes else None
+                voice_text = _transcribe(voice_hash, audio_bytes) if audio_bytes else None
             if voice_text and voice_text.strip():
                 st.session_state[LAST_VOICE_HASH_KEY] = voice_hash
                 st.session_state["pending_voice_text"] = voice_text.strip()
@@ -210,38 +268,8 @@ def main() -> None:
             st.session_state[CHAT_KEY].append(("user", user_text))
             state_before = session.state
             turn: AgentTurn = session.step(user_text)
-            st.session_state[CHAT_KEY].append(("agent", turn.text))
-
-            # Phase 2: run MCP when we just completed a booking, reschedule, or cancel
-            just_confirmed = (
-                state_before == ConversationState.CONFIRMATION
-                and turn.state == ConversationState.BOOKING_COMPLETE
-            )
-            just_cancelled = (
-                state_before == ConversationState.CANCEL_CONFIRM
-                and turn.state == ConversationState.BOOKING_COMPLETE
-                and session.context.existing_booking_code
-            )
-            has_slot = (
-                session.context.chosen_slot_index is not None
-                and len(session.context.offered_slots) > session.context.chosen_slot_index
-            )
-            if just_cancelled:
-                mcp_result = on_cancel_complete(session.context, settings)
-                st.session_state[MCP_RUN_FOR_KEY] = f"cancel:{session.context.existing_booking_code}"
-                st.session_state[MCP_RESULT_KEY] = mcp_result
-            elif just_confirmed and has_slot:
-                # Reschedule: update existing calendar event and sheet row; never create a new booking.
-                if session.context.intent == "reschedule" and session.context.existing_booking_code:
-                    mcp_result = on_reschedule_complete(session.context, settings)
-                    st.session_state[MCP_RUN_FOR_KEY] = f"reschedule:{session.context.existing_booking_code}"
-                elif session.context.intent != "reschedule":
-                    # New booking only when intent is book_new (avoid creating duplicate when reschedule intent was lost)
-                    mcp_result = on_booking_complete(session.context, settings)
-                    st.session_state[MCP_RUN_FOR_KEY] = session.context.booking_code or ""
-                else:
-                    mcp_result = MCPResult()
-                st.session_state[MCP_RESULT_KEY] = mcp_result
+            _append_agent_message(turn.text)
+            _dispatch_mcp(state_before, turn, session, settings)
         st.rerun()
 
     # Phase 2 MCP result (when a booking was just completed)
@@ -253,8 +281,8 @@ def main() -> None:
             if mcp_result.errors:
                 st.warning("Some integrations reported errors: " + "; ".join(mcp_result.errors))
 
-    # Debug panel
-    with st.expander("Debug: conversation state", expanded=False):
+    # Debug panel: a toggle rather than a collapsed expander, so the state dict is only built when shown
+    if st.toggle("Debug: conversation state", value=False, key="show_debug_state"):
         st.write(
             {
                 "state": session.state.name if isinstance(session.state, ConversationState) else str(session.state),
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
 from src.mcp.calendar_mcp import (
     SlotInfo,
@@ -22,6 +23,17 @@ if TYPE_CHECKING:
     from src.config.settings import Settings
     from src.services.conversation_engine import ConversationContext
 
+# Independent calendar/sheets calls are network-bound; run them side by side.
+_mcp_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mcp")
+
+
+def _google_credentials(settings: "Settings") -> tuple[str, Optional[str]]:
+    """Credentials path and inline key JSON for the MCP calls (clients are cached per credentials in src.mcp)."""
+    return (
+        getattr(settings, "google_credentials_path", "") or "",
+        getattr(settings, "google_credentials_json", None),
+    )
+
 
 @dataclass
 class MCPResult:
@@ -39,35 +51,41 @@ def on_booking_complete(context: "ConversationContext", settings: "Settings") ->
     Only call this for a new booking (context.booking_code and context.chosen_slot_index set).
     """
     result = MCPResult()
-    if not context.booking_code or context.chosen_slot_index is None or not context.offered_slots:
-        return result
-    if context.chosen_slot_index >= len(context.offered_slots):
+    booking_code, idx, slots = context.booking_code, context.chosen_slot_index, context.offered_slots
+    if not booking_code or idx is None or not slots or idx >= len(slots):
         return result
 
-    slot = context.offered_slots[context.chosen_slot_index]
+    slot = slots[idx]
     topic = context.topic_label or "Advisor Q&A"
     slot_info = SlotInfo(date=slot.date, time=slot.time, timezone=slot.timezone)
-    creds = getattr(settings, "google_credentials_path", "") or ""
+    creds, creds_json = _google_credentials(settings)
 
-    result.calendar = create_tentative_hold(
+    # Calendar hold and sheet row are independent; issue both requests at once
+    calendar_future = _mcp_executor.submit(
+        create_tentative_hold,
         topic=topic,
-        booking_code=context.booking_code,
+        booking_code=booking_code,
         slot=slot_info,
         calendar_id=settings.google_calendar_id,
         credentials_path=creds,
+        credentials_json=creds_json,
     )
-    if not result.calendar[0]:
-        result.errors.append(result.calendar[1])
-
-    result.sheets = append_prebooking_row(
+    sheets_future = _mcp_executor.submit(
+        append_prebooking_row,
         sheet_id=settings.google_sheet_id,
         credentials_path=creds,
-        booking_code=context.booking_code,
+        credentials_json=creds_json,
+        booking_code=booking_code,
         topic=topic,
         slot_label=slot.label(),
         status="tentative",
         source="voice_agent",
     )
+    result.calendar = calendar_future.result()
+    if not result.calendar[0]:
+        result.errors.append(result.calendar[1])
+
+    result.sheets = sheets_future.result()
     if not result.sheets[0]:
         result.errors.append(result.sheets[1])
 
@@ -80,53 +98,59 @@ def on_reschedule_complete(context: "ConversationContext", settings: "Settings")
     Only call when intent is reschedule, existing_booking_code and chosen_slot are set.
     """
     result = MCPResult()
-    if context.intent != "reschedule" or not context.existing_booking_code:
-        return result
-    if context.chosen_slot_index is None or not context.offered_slots:
-        return result
-    if context.chosen_slot_index >= len(context.offered_slots):
+    code, idx, slots = context.existing_booking_code, context.chosen_slot_index, context.offered_slots
+    if context.intent != "reschedule" or not code or idx is None or not slots or idx >= len(slots):
         return result
 
-    slot = context.offered_slots[context.chosen_slot_index]
+    slot = slots[idx]
     slot_info = SlotInfo(date=slot.date, time=slot.time, timezone=slot.timezone)
-    creds = getattr(settings, "google_credentials_path", "") or ""
+    creds, creds_json = _google_credentials(settings)
     cal_id = settings.google_calendar_id
     topic = context.topic_label or "Advisor Q&A"
 
     event_id = find_event_by_booking_code(
         calendar_id=cal_id,
         credentials_path=creds,
-        code=context.existing_booking_code,
+        credentials_json=creds_json,
+        code=code,
     )
     if not event_id:
         result.calendar = (False, "Booking code not found on calendar.")
         result.errors.append(result.calendar[1])
         return result
 
-    result.calendar = update_event_to_slot(
+    # Move the calendar event and update the existing sheet row (new slot, status "rescheduled",
+    # no duplicate row) concurrently; the two calls do not depend on each other.
+    calendar_future = _mcp_executor.submit(
+        update_event_to_slot,
         calendar_id=cal_id,
         credentials_path=creds,
+        credentials_json=creds_json,
         event_id=event_id,
         slot=slot_info,
     )
-    if not result.calendar[0]:
-        result.errors.append(result.calendar[1])
-
-    # Update the existing sheet row to new slot and status "rescheduled" (no duplicate row)
-    result.sheets = update_prebooking_row_for_reschedule(
+    sheets_future = _mcp_executor.submit(
+        update_prebooking_row_for_reschedule,
         sheet_id=settings.google_sheet_id,
         credentials_path=creds,
-        booking_code=context.existing_booking_code,
+        credentials_json=creds_json,
+        booking_code=code,
         new_slot_label=slot.label(),
         new_status="rescheduled",
     )
+    result.calendar = calendar_future.result()
+    if not result.calendar[0]:
+        result.errors.append(result.calendar[1])
+
+    result.sheets = sheets_future.result()
     if not result.sheets[0]:
         result.errors.append(result.sheets[1])
         # Fallback: append a reschedule row so we still have an audit trail
         append_ok, append_msg = append_prebooking_row(
             sheet_id=settings.google_sheet_id,
             credentials_path=creds,
-            booking_code=context.existing_booking_code,
+            credentials_json=creds_json,
+            booking_code=code,
             topic=topic,
             slot_label=slot.label(),
             status="rescheduled",
@@ -145,22 +169,35 @@ def on_cancel_complete(context: "ConversationContext", settings: "Settings") ->
     Booking code is matched with normalization (e.g. "NLP 760" matches "NL-P760").
     """
     result = MCPResult()
-    if context.intent != "cancel" or not context.existing_booking_code:
+    code = context.existing_booking_code
+    if context.intent != "cancel" or not code:
         return result
 
-    creds = getattr(settings, "google_credentials_path", "") or ""
+    creds, creds_json = _google_credentials(settings)
     cal_id = settings.google_calendar_id
-    code = context.existing_booking_code.strip()
+    code = code.strip()
 
+    # The sheet row is marked cancelled whether or not the event is found, so start it
+    # right away and overlap it with the calendar lookup + delete.
+    sheets_future = _mcp_executor.submit(
+        update_prebooking_row_status,
+        sheet_id=settings.google_sheet_id,
+        credentials_path=creds,
+        credentials_json=creds_json,
+        booking_code=code,
+        new_status="cancelled",
+    )
     event_id = find_event_by_booking_code(
         calendar_id=cal_id,
         credentials_path=creds,
+        credentials_json=creds_json,
         code=code,
     )
     if event_id:
         result.calendar = delete_event_by_id(
             calendar_id=cal_id,
             credentials_path=creds,
+            credentials_json=creds_json,
             event_id=event_id,
         )
         if not result.calendar[0]:
@@ -169,12 +206,7 @@ def on_cancel_complete(context: "ConversationContext", settings: "Settings") ->
         result.calendar = (False, "Booking code not found on calendar.")
         result.errors.append(result.calendar[1])
 
-    result.sheets = update_prebooking_row_status(
-        sheet_id=settings.google_sheet_id,
-        credentials_path=creds,
-        booking_code=code,
-        new_status="cancelled",
-    )
+    result.sheets = sheets_future.result()
     if not result.sheets[0]:
         result.errors.append(result.sheets[1])
 
@@ -1,11 +1,16 @@
-"""Booking code generator for advisor appointments."""
+"""Booking code generation and parsing for advisor appointments."""
 
 from __future__ import annotations
 
-import random
+import secrets
 import string
 
 from src.config.settings import BOOKING_CODE_PREFIX
+# Parsing lives beside normalization so the MCP adapters and the engine share one code rule
+from src.mcp._booking_code import parse_booking_code
+
+_CODE_PREFIX = f"{BOOKING_CODE_PREFIX}-"
+_LETTERS = string.ascii_uppercase
 
 
 def generate_booking_code() -> str:
@@ -14,12 +19,12 @@ def generate_booking_code() -> str:
     - Prefix from `BOOKING_CODE_PREFIX` (e.g. 'NL')
     - One random uppercase letter
     - Three-digit number
-    """
 
-    letter = random.choice(string.ascii_uppercase)
-    number = random.randint(100, 999)
-    return f"{BOOKING_CODE_PREFIX}-{letter}{number}"
+    Letter and number come from a single unbiased `secrets` draw.
+    """
 
+    letter_idx, number = divmod(secrets.randbelow(len(_LETTERS) * 900), 900)
+    return f"{_CODE_PREFIX}{_LETTERS[letter_idx]}{number + 100}"
 
-__all__ = ["generate_booking_code"]
 
+__all__ = ["generate_booking_code", "parse_booking_code"]
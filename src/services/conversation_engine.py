@@ -14,32 +14,144 @@ States:
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
-from enum import Enum, auto
-from typing import List, Optional
+from datetime import date
+from enum import IntEnum
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
 
-from src.config.settings import DISCLAIMER, TOPICS
-from src.services.booking_code import generate_booking_code
+from src.config.settings import DATACLASS_SLOTS, DISCLAIMER, TAXONOMY_INDEX, TOPICS, match_keywords
+from src.services.booking_code import generate_booking_code, parse_booking_code
 from src.services.intent_classifier import IntentResult, KeywordIntentClassifier
 from src.services.slot_manager import Slot, offer_slots
 from src.services.slot_manager import _parse_preferred_datetime as parse_preferred_datetime
 
+# Word tokens of an utterance; apostrophes stay inside words so "don't" is one token
+_WORD_RE = re.compile(r"[a-z0-9'’]+")
+
+# Reply vocabularies: single words are matched as whole tokens (so "know" is not "no" and
+# "none" is not "one"); multi-word phrases are matched as substrings.
+_CONTINUE_WORDS = frozenset({"yes", "yeah", "yep", "ok", "okay", "sure", "continue"})
+_CONTINUE_PHRASES = ("go ahead",)
+# Inflected forms are listed so "I'm cancelling my booking" still reads as cancel, not book
+_CANCEL_FORMS = frozenset({
+    "cancel", "cancels", "canceled", "cancelled", "canceling", "cancelling", "cancellation",
+})
+_CANCEL_WORDS = _CANCEL_FORMS | {"abort", "delete", "remove"}
+_RESCHEDULE_WORDS = frozenset({"reschedule", "reschedules", "rescheduled", "rescheduling", "postpone"})
+_RESCHEDULE_PHRASES = ("change booking", "move my slot", "different time")
+_BOOK_WORDS = frozenset({"book", "booking", "appointment"})
+_BOOK_PHRASES = ("new slot", "schedule a")
+_BOOK_FALLBACK_WORDS = frozenset({"schedule", "slot", "meeting"})
+_CANCEL_YES_WORDS = frozenset({"yes", "yeah", "yep", "ok", "okay", "sure", "confirm"}) | _CANCEL_FORMS
+_CONFIRM_YES_WORDS = frozenset({"yes", "yeah", "yep", "ok", "okay", "sure", "confirm", "book"})
+_CONFIRM_YES_PHRASES = ("go ahead", "sounds good")
+_NO_WORDS = frozenset({"no", "nope", "not", "don't", "dont", "don’t"})
+_NO_PHRASES = ("do not",)
+_CHANGE_WORDS = _NO_WORDS | {"change", "different"}
+_NONE_WORDS = frozenset({"none", "neither"})
+# Ordinals are checked before bare numbers so "the second one" picks option 2
+_FIRST_WORDS = frozenset({"first", "1", "1st"})
+_SECOND_WORDS = frozenset({"second", "2", "2nd"})
+# Bare yes/no replies (the usual STT output at a confirmation prompt) resolve with one dict probe
+_YES_NO_REPLIES: Dict[str, bool] = {
+    "yes": True, "yeah": True, "yep": True, "y": True, "ok": True, "okay": True, "sure": True,
+    "no": False, "n": False, "nope": False,
+}
+
+# Fixed agent replies (and the one per-session template) built once at import
+_INTENT_MENU_TEXT = (
+    "Great. What would you like to do today?\n\n"
+    "• **Book a new advisor slot** — I'll collect your topic and preferred time, then offer two slots.\n"
+    "• **Reschedule** — Change an existing booking (you'll need your booking code).\n"
+    "• **Cancel** — Cancel an existing booking (you'll need your booking code).\n\n"
+    "Please say: book new, reschedule, or cancel."
+)
+_INTENT_UNCLEAR_TEXT = (
+    "I didn't catch that. What would you like to do?\n\n"
+    "• Say **book new** to book a new advisor slot.\n"
+    "• Say **reschedule** to change an existing booking.\n"
+    "• Say **cancel** to cancel an existing booking."
+)
+_TOPIC_MENU_TEXT = (
+    "I didn't quite catch the topic. Please choose one of these:\n"
+    "- KYC/Onboarding\n- SIP/Mandates\n- Statements/Tax Docs\n"
+    "- Withdrawals & Timelines\n- Account Changes/Nominee"
+)
+_SLOT_CHOICE_HINT = (
+    "Please say 'first' or 'option 1', or 'second' or 'option 2'. "
+    "If neither works, say 'none'."
+)
+_ASK_CODE_TEXT = "Please tell me your booking code (for example, NL-A742)."
+_NOT_A_CODE_TEXT = "That doesn't look like a booking code. It should look like NL-A742; please say or type it again."
+_BOOKING_HOURS_TEMPLATE = (
+    "You can book a slot, if available, **Tuesday through Saturday, between 9am and 5pm** ({tz})."
+)
+
+
+class _Utterance(NamedTuple):
+    """One user reply, normalized once per turn and shared by the classifier and the state handlers."""
+
+    raw: str
+    stripped: str
+    lowered: str  # stripped and lowercased
+    tokens: FrozenSet[str]
+
+    @classmethod
+    def of(cls, user_text: str) -> "_Utterance":
+        stripped = user_text.strip()
+        lowered = stripped.lower()
+        return cls(user_text, stripped, lowered, frozenset(_WORD_RE.findall(lowered)))
+
+
+def _says(utterance: _Utterance, words: FrozenSet[str], phrases: Tuple[str, ...] = ()) -> bool:
+    """True if any of `words` is a token of the reply or any of `phrases` occurs in it."""
+    return not utterance.tokens.isdisjoint(words) or any(p in utterance.lowered for p in phrases)
+
+
+def _yes_or_no(
+    utterance: _Utterance,
+    yes_words: FrozenSet[str],
+    yes_phrases: Tuple[str, ...],
+    no_words: FrozenSet[str] = _NO_WORDS,
+) -> Optional[bool]:
+    """
+    True/False for a clear yes/no reply, None when the reply is neither or both
+    (e.g. "don't cancel" says "cancel" and "don't"), so the caller asks again.
+    """
+    answer = _YES_NO_REPLIES.get(utterance.lowered.rstrip(".!"))
+    if answer is not None:
+        return answer
+    yes = _says(utterance, yes_words, yes_phrases)
+    if yes == _says(utterance, no_words, _NO_PHRASES):
+        return None
+    return yes
+
+
+class ConversationState(IntEnum):
+    # Explicit ints: stable IDs in logs, and C-level hashing for the handler table.
+    GREETING = 1
+    DISCLAIMER = 2
+    INTENT_CONFIRMATION = 3
+    TOPIC_COLLECTION = 4
+    DATETIME_COLLECTION = 5
+    SLOT_OFFER = 6
+    CONFIRMATION = 7
+    BOOKING_COMPLETE = 8
+    RESCHEDULE_ASK_CODE = 9
+    CANCEL_ASK_CODE = 10
+    CANCEL_CONFIRM = 11
 
-class ConversationState(Enum):
-    GREETING = auto()
-    DISCLAIMER = auto()
-    INTENT_CONFIRMATION = auto()
-    TOPIC_COLLECTION = auto()
-    DATETIME_COLLECTION = auto()
-    SLOT_OFFER = auto()
-    CONFIRMATION = auto()
-    BOOKING_COMPLETE = auto()
-    RESCHEDULE_ASK_CODE = auto()
-    CANCEL_ASK_CODE = auto()
-    CANCEL_CONFIRM = auto()
 
+# States whose handling reads the classified intent (see step())
+_CLASSIFY_STATES = frozenset({
+    ConversationState.GREETING,
+    ConversationState.DISCLAIMER,
+    ConversationState.INTENT_CONFIRMATION,
+})
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class ConversationContext:
     intent: Optional[str] = None
     topic_label: Optional[str] = None
@@ -50,7 +162,7 @@ class ConversationContext:
     existing_booking_code: Optional[str] = None  # for reschedule/cancel
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AgentTurn:
     text: str
     state: ConversationState
@@ -61,50 +173,35 @@ class AgentTurn:
 class ConversationSession:
     """Encapsulates stateful dialog behavior."""
 
+    __slots__ = ("state", "context", "_intent_classifier", "_timezone_label", "_booking_hours_text", "_slot_cache")
+
     def __init__(self, timezone_label: str = "IST") -> None:
         self.state = ConversationState.GREETING
         self.context = ConversationContext()
         self._intent_classifier = KeywordIntentClassifier()
         self._timezone_label = timezone_label
+        self._booking_hours_text = _BOOKING_HOURS_TEMPLATE.format(tz=timezone_label)
+        # (preference text, today) -> offered slots; repeated/retried preferences skip the calendar lookup
+        self._slot_cache: Dict[Tuple[str, str], List[Slot]] = {}
 
     # Public API ---------------------------------------------------------
     def step(self, user_text: str) -> AgentTurn:
         """Advance the conversation based on user input."""
-        intent_result = self._intent_classifier.classify(user_text)
+        utterance = _Utterance.of(user_text)
+        # Intent only matters while the user is choosing what to do; later states get an empty result
+        if self.state in _CLASSIFY_STATES:
+            intent_result = self._intent_classifier.classify_lowered(utterance.lowered, user_text)
+        else:
+            intent_result = IntentResult(intent=None, confidence=0.0, raw_text=user_text)
         # Only update context.intent from classifier when user is choosing intent.
         # Never overwrite during reschedule/cancel flow (existing_booking_code set) so we
         # always call on_reschedule_complete and update the existing event, not create a new one.
-        if intent_result.intent and not self.context.existing_booking_code and self.state in (
-            ConversationState.GREETING,
-            ConversationState.DISCLAIMER,
-            ConversationState.INTENT_CONFIRMATION,
-        ):
+        if intent_result.intent and not self.context.existing_booking_code:
             self.context.intent = intent_result.intent
 
-        if self.state == ConversationState.GREETING:
-            return self._handle_greeting(intent_result)
-        if self.state == ConversationState.DISCLAIMER:
-            return self._handle_disclaimer(user_text, intent_result)
-        if self.state == ConversationState.INTENT_CONFIRMATION:
-            return self._handle_intent_confirmation(user_text, intent_result)
-        if self.state == ConversationState.TOPIC_COLLECTION:
-            return self._handle_topic(user_text, intent_result)
-        if self.state == ConversationState.DATETIME_COLLECTION:
-            return self._handle_datetime(user_text, intent_result)
-        if self.state == ConversationState.SLOT_OFFER:
-            return self._handle_slot_choice(user_text, intent_result)
-        if self.state == ConversationState.CONFIRMATION:
-            return self._handle_confirmation(user_text, intent_result)
-        if self.state == ConversationState.BOOKING_COMPLETE:
-            # Once complete, keep reminding user of booking details.
-            text = self._summarize_booking()
-            return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
-        if self.state == ConversationState.RESCHEDULE_ASK_CODE:
-            return self._handle_reschedule_ask_code(user_text, intent_result)
-        if self.state == ConversationState.CANCEL_ASK_CODE:
-            return self._handle_cancel_ask_code(user_text, intent_result)
-        if self.state == ConversationState.CANCEL_CONFIRM:
-            return self._handle_cancel_confirm(user_text, intent_result)
+        handler = self._HANDLERS.get(self.state)
+        if handler is not None:
+            return handler(self, utterance, intent_result)
 
         # Fallback
         return AgentTurn(
@@ -115,7 +212,7 @@ class ConversationSession:
         )
 
     # State handlers -----------------------------------------------------
-    def _handle_greeting(self, intent_result: IntentResult) -> AgentTurn:
+    def _handle_greeting(self, utterance: _Utterance, intent_result: IntentResult) -> AgentTurn:
         self.state = ConversationState.DISCLAIMER
         text = (
             "Hello, you're speaking with the Advisor Appointment Assistant. "
@@ -126,33 +223,30 @@ class ConversationSession:
         )
         return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
-    def _handle_disclaimer(self, user_text: str, intent_result: IntentResult) -> AgentTurn:
-        lowered = user_text.lower()
-        if any(x in lowered for x in ["yes", "yeah", "ok", "sure", "continue", "go ahead"]):
+    def _handle_booking_complete(self, utterance: _Utterance, intent_result: IntentResult) -> AgentTurn:
+        # Once complete, keep reminding user of booking details.
+        text = self._summarize_booking()
+        return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
+
+    def _handle_disclaimer(self, utterance: _Utterance, intent_result: IntentResult) -> AgentTurn:
+        if _says(utterance, _CONTINUE_WORDS, _CONTINUE_PHRASES):
             self.state = ConversationState.INTENT_CONFIRMATION
-            text = (
-                "Great. What would you like to do today?\n\n"
-                "• **Book a new advisor slot** — I'll collect your topic and preferred time, then offer two slots.\n"
-                "• **Reschedule** — Change an existing booking (you'll need your booking code).\n"
-                "• **Cancel** — Cancel an existing booking (you'll need your booking code).\n\n"
-                "Please say: book new, reschedule, or cancel."
-            )
+            text = _INTENT_MENU_TEXT
         else:
             text = "No problem. When you're ready, just say you'd like to continue with booking or questions."
         return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
-    def _handle_intent_confirmation(self, user_text: str, intent_result: IntentResult) -> AgentTurn:
-        lowered = user_text.lower().strip()
+    def _handle_intent_confirmation(self, utterance: _Utterance, intent_result: IntentResult) -> AgentTurn:
         # Check cancel first so "cancel" / "abort" / "delete" / "remove" are never treated as reschedule
-        if any(x in lowered for x in ["cancel", "abort", "delete", "remove", "delete booking", "remove booking"]):
+        if _says(utterance, _CANCEL_WORDS):
             intent = "cancel"
-        elif "reschedule" in lowered or any(x in lowered for x in ["change booking", "move my slot", "postpone", "different time"]):
+        elif _says(utterance, _RESCHEDULE_WORDS, _RESCHEDULE_PHRASES):
             intent = "reschedule"
-        elif intent_result.intent == "book_new" or any(x in lowered for x in ["book", "new slot", "appointment", "schedule a", "book a"]):
+        elif intent_result.intent == "book_new" or _says(utterance, _BOOK_WORDS, _BOOK_PHRASES):
             intent = "book_new"
         else:
             intent = intent_result.intent
-            if not intent and any(x in lowered for x in ["schedule", "slot", "meeting"]):
+            if not intent and _says(utterance, _BOOK_FALLBACK_WORDS):
                 intent = "book_new"
 
         if intent == "book_new":
@@ -182,80 +276,65 @@ class ConversationSession:
             )
             return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
-        text = (
-            "I didn't catch that. What would you like to do?\n\n"
-            "• Say **book new** to book a new advisor slot.\n"
-            "• Say **reschedule** to change an existing booking.\n"
-            "• Say **cancel** to cancel an existing booking."
-        )
+        text = _INTENT_UNCLEAR_TEXT
         return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
-    def _handle_reschedule_ask_code(self, user_text: str, intent_result: IntentResult) -> AgentTurn:
-        code = user_text.strip() or None
-        if not code:
-            text = "Please tell me your booking code (for example, NL-A742)."
-            return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
+    def _handle_ask_code(self, utterance: _Utterance, intent_result: IntentResult) -> AgentTurn:
+        """Booking-code step of both the reschedule and the cancel flow; only the follow-up differs."""
+        if not utterance.stripped:
+            return AgentTurn(text=_ASK_CODE_TEXT, state=self.state, context=self.context, intent_result=intent_result)
+        code = parse_booking_code(utterance.stripped)
+        if code is None:
+            return AgentTurn(text=_NOT_A_CODE_TEXT, state=self.state, context=self.context, intent_result=intent_result)
         self.context.existing_booking_code = code
-        self.state = ConversationState.DATETIME_COLLECTION
-        text = (
-            f"Thanks. To which date and time would you like to reschedule? "
-            "You can book a slot, if available, **Tuesday through Saturday, between 9am and 5pm** "
-            f"({self._timezone_label})."
-        )
-        return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
-
-    def _handle_cancel_ask_code(self, user_text: str, intent_result: IntentResult) -> AgentTurn:
-        code = user_text.strip() or None
-        if not code:
-            text = "Please tell me your booking code (for example, NL-A742)."
-            return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
-        self.context.existing_booking_code = code
-        self.state = ConversationState.CANCEL_CONFIRM
-        text = (
-            f"I'll cancel the booking for code **{code}**. "
-            "Confirm cancellation? Say yes or no."
-        )
+        if self.state == ConversationState.RESCHEDULE_ASK_CODE:
+            self.state = ConversationState.DATETIME_COLLECTION
+            text = (
+                "Thanks. To which date and time would you like to reschedule? "
+                f"{self._booking_hours_text}"
+            )
+        else:
+            self.state = ConversationState.CANCEL_CONFIRM
+            text = (
+                f"I'll cancel the booking for code **{code}**. "
+                "Confirm cancellation? Say yes or no."
+            )
         return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
-    def _handle_cancel_confirm(self, user_text: str, intent_result: IntentResult) -> AgentTurn:
-        lowered = user_text.lower()
-        if any(x in lowered for x in ["yes", "yeah", "confirm", "go ahead", "cancel", "sure", "ok"]):
+    def _handle_cancel_confirm(self, utterance: _Utterance, intent_result: IntentResult) -> AgentTurn:
+        answer = _yes_or_no(utterance, _CANCEL_YES_WORDS, _CONTINUE_PHRASES)
+        if answer:
             code = self.context.existing_booking_code or "your booking"
             self.state = ConversationState.BOOKING_COMPLETE
             text = f"Cancellation recorded for **{code}**. You will receive a confirmation. Anything else?"
             return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
-        if any(x in lowered for x in ["no", "don't", "do not"]):
+        if answer is False:
             self.state = ConversationState.INTENT_CONFIRMATION
             text = "Cancellation not done. What would you like to do: book new, reschedule, or cancel?"
             return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
         text = "Please say yes to confirm cancellation, or no to keep the booking."
         return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
-    def _handle_topic(self, user_text: str, intent_result: IntentResult) -> AgentTurn:
-        topic_label = self._detect_topic(user_text)
+    def _handle_topic(self, utterance: _Utterance, intent_result: IntentResult) -> AgentTurn:
+        topic_label = self._detect_topic(utterance.lowered)
         if not topic_label:
-            text = (
-                "I didn't quite catch the topic. Please choose one of these:\n"
-                "- KYC/Onboarding\n- SIP/Mandates\n- Statements/Tax Docs\n"
-                "- Withdrawals & Timelines\n- Account Changes/Nominee"
-            )
+            text = _TOPIC_MENU_TEXT
             return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
         self.context.topic_label = topic_label
         self.state = ConversationState.DATETIME_COLLECTION
         text = (
             f"Got it, we'll discuss **{topic_label}**.\n\n"
-            "You can book a slot, if available, **Tuesday through Saturday, between 9am and 5pm** "
-            f"({self._timezone_label}). "
+            f"{self._booking_hours_text} "
             "On which day and roughly what time would you prefer to speak with the advisor?"
         )
         return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
-    def _handle_datetime(self, user_text: str, intent_result: IntentResult) -> AgentTurn:
-        self.context.preferred_datetime_text = user_text.strip() or None
+    def _handle_datetime(self, utterance: _Utterance, intent_result: IntentResult) -> AgentTurn:
+        self.context.preferred_datetime_text = utterance.stripped or None
 
         # Get two slots matching preference (e.g. Friday, 10am).
-        slots = offer_slots(preferred_datetime_text=self.context.preferred_datetime_text)
+        slots = self._offer_slots(self.context.preferred_datetime_text)
         self.context.offered_slots = slots
         self.state = ConversationState.SLOT_OFFER
 
@@ -275,26 +354,23 @@ class ConversationSession:
         text = (
             "Thanks. Based on your preference, here are two available slots:\n\n"
             f"{options_text}\n\n"
-            "Please say 'first' or 'option 1', or 'second' or 'option 2'. "
-            "If neither works, say 'none'."
+            f"{_SLOT_CHOICE_HINT}"
         )
         return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
-    def _handle_slot_choice(self, user_text: str, intent_result: IntentResult) -> AgentTurn:
-        lowered = user_text.lower().strip()
+    def _handle_slot_choice(self, utterance: _Utterance, intent_result: IntentResult) -> AgentTurn:
         # If user re-states a date/time (e.g. "Friday, 10am"), treat as "different slot" and re-offer
-        pref_weekday, pref_minutes, _ = parse_preferred_datetime(user_text)
-        if (pref_weekday is not None or pref_minutes is not None) and len(lowered) > 2:
-            self.context.preferred_datetime_text = user_text.strip()
-            slots = offer_slots(preferred_datetime_text=self.context.preferred_datetime_text)
+        pref_weekday, pref_minutes, _ = parse_preferred_datetime(utterance.raw)
+        if (pref_weekday is not None or pref_minutes is not None) and len(utterance.lowered) > 2:
+            self.context.preferred_datetime_text = utterance.stripped
+            slots = self._offer_slots(self.context.preferred_datetime_text)
             self.context.offered_slots = slots
             if slots:
                 lines = [f"{i}. {s.label()}" for i, s in enumerate(slots, start=1)]
                 text = (
                     "No problem. Based on your new preference, here are two available slots:\n\n"
                     + "\n".join(lines) + "\n\n"
-                    "Please say 'first' or 'option 1', or 'second' or 'option 2'. "
-                    "If neither works, say 'none'."
+                    + _SLOT_CHOICE_HINT
                 )
             else:
                 text = (
@@ -306,8 +382,7 @@ class ConversationSession:
             return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
         idx: Optional[int]
-        # Check "none"/"neither" before "one" (so "none" is not matched as "one")
-        if "none" in lowered or "neither" in lowered:
+        if _says(utterance, _NONE_WORDS):
             self.state = ConversationState.BOOKING_COMPLETE
             text = (
                 "I understand that none of the suggested slots work for you. "
@@ -315,9 +390,13 @@ class ConversationSession:
                 "offer alternatives. You won't be booked into any slot right now."
             )
             return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
-        if any(x in lowered for x in ["first", "1", "one", "option 1", "slot 1"]):
+        if _says(utterance, _FIRST_WORDS):
             idx = 0
-        elif any(x in lowered for x in ["second", "2", "two", "option 2", "slot 2"]):
+        elif _says(utterance, _SECOND_WORDS):
+            idx = 1
+        elif "one" in utterance.tokens:
+            idx = 0
+        elif "two" in utterance.tokens:
             idx = 1
         else:
             text = (
@@ -342,20 +421,23 @@ class ConversationSession:
         )
         return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
-    def _handle_confirmation(self, user_text: str, intent_result: IntentResult) -> AgentTurn:
-        lowered = user_text.lower()
-        if any(x in lowered for x in ["yes", "yeah", "confirm", "go ahead", "book", "sounds good", "ok", "sure"]):
+    def _handle_confirmation(self, utterance: _Utterance, intent_result: IntentResult) -> AgentTurn:
+        answer = _yes_or_no(utterance, _CONFIRM_YES_WORDS, _CONFIRM_YES_PHRASES, _CHANGE_WORDS)
+        if answer:
             if self.context.intent == "reschedule":
                 # Reschedule: keep existing_booking_code; don't generate new code
                 self.state = ConversationState.BOOKING_COMPLETE
             else:
                 self.context.booking_code = generate_booking_code()
                 self.state = ConversationState.BOOKING_COMPLETE
+            # The chosen slot is now taken; later offers must come from fresh availability
+            self._slot_cache.clear()
             text = self._summarize_booking()
             return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
-        if any(x in lowered for x in ["no", "don't", "do not", "change", "different"]):
+        if answer is False:
             # Let user pick a different time.
+            self._slot_cache.clear()
             self.state = ConversationState.DATETIME_COLLECTION
             text = (
                 "No problem, we won't book that slot. "
@@ -368,13 +450,22 @@ class ConversationSession:
         return AgentTurn(text=text, state=self.state, context=self.context, intent_result=intent_result)
 
     # Helpers -------------------------------------------------------------
-    def _detect_topic(self, user_text: str) -> Optional[str]:
-        lowered = user_text.lower()
-        for label, keywords in TOPICS.items():
-            for kw in keywords:
-                if kw.lower() in lowered:
-                    return label
-        return None
+    def _offer_slots(self, preferred_datetime_text: Optional[str]) -> List[Slot]:
+        key = (preferred_datetime_text or "", date.today().isoformat())
+        slots = self._slot_cache.get(key)
+        if slots is None:
+            slots = self._slot_cache[key] = offer_slots(preferred_datetime_text=preferred_datetime_text)
+        # Copy so context.offered_slots never aliases the cached list
+        return list(slots)
+
+    def _detect_topic(self, lowered: str) -> Optional[str]:
+        hits = {
+            category
+            for taxonomy, category in match_keywords(lowered, TAXONOMY_INDEX)
+            if taxonomy == "topic"
+        }
+        # First topic in TOPICS order wins when several match
+        return next((label for label in TOPICS if label in hits), None)
 
     def _summarize_booking(self) -> str:
         # Reschedule complete: chosen slot + existing code
@@ -419,6 +510,21 @@ class ConversationSession:
             "If you'd like, we can look at more times or place you on a waitlist."
         )
 
+    # State -> handler table used by step(); one dict probe instead of an if-chain per turn
+    _HANDLERS: Dict[ConversationState, Callable[["ConversationSession", _Utterance, IntentResult], AgentTurn]] = {
+        ConversationState.GREETING: _handle_greeting,
+        ConversationState.DISCLAIMER: _handle_disclaimer,
+        ConversationState.INTENT_CONFIRMATION: _handle_intent_confirmation,
+        ConversationState.TOPIC_COLLECTION: _handle_topic,
+        ConversationState.DATETIME_COLLECTION: _handle_datetime,
+        ConversationState.SLOT_OFFER: _handle_slot_choice,
+        ConversationState.CONFIRMATION: _handle_confirmation,
+        ConversationState.BOOKING_COMPLETE: _handle_booking_complete,
+        ConversationState.RESCHEDULE_ASK_CODE: _handle_ask_code,
+        ConversationState.CANCEL_ASK_CODE: _handle_ask_code,
+        ConversationState.CANCEL_CONFIRM: _handle_cancel_confirm,
+    }
+
 
 __all__ = ["ConversationState", "ConversationContext", "AgentTurn", "ConversationSession"]
 
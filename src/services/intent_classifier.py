@@ -6,10 +6,13 @@ and is easy to unit-test. Later we can optionally add a Groq-backed
 classifier behind the same interface.
 """
 
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-from src.config.settings import INTENTS
+from src.config.settings import INTENTS, TAXONOMY_INDEX, build_keyword_index, match_keywords
 
 
 IntentName = str
@@ -36,26 +39,36 @@ class KeywordIntentClassifier:
 
     def __init__(self, intents: Dict[IntentName, List[str]] | None = None) -> None:
         self._intents: Dict[IntentName, List[str]] = intents or INTENTS
+        # Default taxonomy shares the app-wide keyword table; custom intents get their own
+        self._index = TAXONOMY_INDEX if self._intents is INTENTS else build_keyword_index({"intent": self._intents})
+        # Fixed intent order: scores are counted in a list indexed by position in the taxonomy
+        self._intent_names: Tuple[IntentName, ...] = tuple(self._intents)
+        self._intent_positions: Dict[IntentName, int] = {name: i for i, name in enumerate(self._intent_names)}
 
     def classify(self, text: str) -> IntentResult:
-        lowered = text.lower().strip()
-        if not lowered:
-            return IntentResult(intent=None, confidence=0.0, raw_text=text)
-
-        best_intent: Optional[IntentName] = None
-        best_score = 0
-
-        for intent, keywords in self._intents.items():
-            score = 0
-            for kw in keywords:
-                if kw.lower() in lowered:
-                    score += 1
-            if score > best_score:
-                best_score = score
-                best_intent = intent
+        return self.classify_lowered(text.lower().strip(), text)
 
-        if best_score == 0 or best_intent is None:
+    def classify_lowered(self, lowered: str, text: str) -> IntentResult:
+        """Classify text the caller has already lowercased and stripped (`text` is kept as raw_text)."""
+        if not lowered:
             return IntentResult(intent=None, confidence=0.0, raw_text=text)
+        # Every default-taxonomy classifier scores alike, so those share one cache across sessions
+        score = _score_default if self._index is TAXONOMY_INDEX else self._score
+        intent, confidence = score(lowered)
+        return IntentResult(intent=intent, confidence=confidence, raw_text=text)
+
+    def _score(self, lowered: str) -> Tuple[Optional[IntentName], float]:
+        """(best intent, confidence) for non-empty lowercased text; (None, 0.0) when nothing matches."""
+        scores = [0] * len(self._intent_names)
+        for taxonomy, intent in match_keywords(lowered, self._index):
+            if taxonomy == "intent":
+                scores[self._intent_positions[intent]] += 1
+
+        best_score = max(scores, default=0)
+        if best_score == 0:
+            return None, 0.0
+        # index() finds the first maximum, so ties keep going to the earlier intent
+        best_intent = self._intent_names[scores.index(best_score)]
 
         # Rough confidence heuristic: 0.4, 0.7, 0.9+ depending on matches.
         if best_score == 1:
@@ -65,13 +78,21 @@ class KeywordIntentClassifier:
         else:
             confidence = 0.9
 
-        return IntentResult(intent=best_intent, confidence=confidence, raw_text=text)
+        return best_intent, confidence
+
+
+_default_classifier = KeywordIntentClassifier()
+
+
+@lru_cache(maxsize=1024)
+def _score_default(lowered: str) -> Tuple[Optional[IntentName], float]:
+    """Default-taxonomy scores per normalized utterance; replies like "yes" or "book" repeat constantly."""
+    return _default_classifier._score(lowered)
 
 
 def classify_intent(text: str) -> IntentResult:
-    """Convenience function for one-off intent classification."""
-    classifier = KeywordIntentClassifier()
-    return classifier.classify(text)
+    """Convenience function for one-off intent classification (shares one default classifier)."""
+    return _default_classifier.classify(text)
 
 
 __all__ = ["IntentResult", "KeywordIntentClassifier", "classify_intent"]
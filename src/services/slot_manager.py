@@ -6,12 +6,18 @@ ranked by proximity to the preferred time.
 
 from __future__ import annotations
 
+import calendar
+import heapq
 import json
 import re
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
+
+from src.config.settings import DATACLASS_SLOTS
 
 DATA_PATH = Path(__file__).resolve().parents[2] / "data" / "mock_calendar.json"
 
@@ -25,6 +31,33 @@ MONTH_NAMES = [
     "july", "august", "september", "october", "november", "december"
 ]
 MONTH_ABBREV = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+# Display names for Slot.label() (same as strftime's %A / %b in the C locale)
+_WEEKDAY_LABELS = [name.capitalize() for name in WEEKDAY_NAMES]
+_MONTH_LABELS = [abbr.capitalize() for abbr in MONTH_ABBREV]
+
+# Patterns used on every datetime reply, compiled once:
+# (month 1-12, abbreviation, "4 feb" / "4 february" pattern, "feb 4" / "february 4" pattern)
+_MONTH_DAY_PATTERNS: List[Tuple[int, str, re.Pattern[str], re.Pattern[str]]] = [
+    (
+        month_idx,
+        abbr,
+        re.compile(rf"(\d{{1,2}})\s*(?:{re.escape(full)}|{re.escape(abbr)})\b"),
+        re.compile(rf"(?:{re.escape(full)}|{re.escape(abbr)})\s*(\d{{1,2}})\b"),
+    )
+    for month_idx, (full, abbr) in enumerate(zip(MONTH_NAMES, MONTH_ABBREV), start=1)
+]
+# Spoken dates ("4 Feb") carry no year; they are read in this one.
+# (days in month, weekday of the 1st) for each month, so validating a day needs no datetime.
+_PARSE_YEAR = 2026
+_MONTH_CALENDAR: List[Tuple[int, int]] = [
+    (calendar.monthrange(_PARSE_YEAR, month)[1], date(_PARSE_YEAR, month, 1).weekday())
+    for month in range(1, 13)
+]
+# Time of day, and the bare "10am" fallback
+_TIME_RE = re.compile(r"(?:^|\s)(\d{1,2})\s*:?\s*(\d{2})?\s*(am|pm)?(?:\s|$|,)")
+_AMPM_WORD_RE = re.compile(r"\b(\d{1,2})\s*(am|pm)\b")
+# Every date and time pattern above needs a digit; replies without one skip them all
+_DIGIT_RE = re.compile(r"\d")
 
 
 def _parse_preferred_datetime(text: str) -> Tuple[Optional[int], Optional[int], Optional[str]]:
@@ -33,41 +66,36 @@ def _parse_preferred_datetime(text: str) -> Tuple[Optional[int], Optional[int],
     Returns (preferred_weekday 0-6, preferred_minutes_since_midnight, preferred_date YYYY-MM-DD or None).
     When both a weekday and a date (e.g. "4 Feb") are present, the explicit date is preferred for filtering.
     """
-    if not text or not text.strip():
+    lowered = text.strip().lower() if text else ""
+    if not lowered:
         return None, None, None
-    lowered = text.lower().strip()
+    return _parse_lowered_datetime(lowered)
+
+
+@lru_cache(maxsize=512)
+def _parse_lowered_datetime(lowered: str) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+    """Body of _parse_preferred_datetime, memoized on the normalized text (the result is a pure function of it)."""
     weekday: Optional[int] = None
     preferred_date: Optional[str] = None
+    has_digit = _DIGIT_RE.search(lowered) is not None
 
     # 1) Date-like first: "4 Feb", "Feb 4", "6 February" — explicit date overrides weekday
-    for month_idx, (full, abbr) in enumerate(zip(MONTH_NAMES, MONTH_ABBREV), start=1):
-        # "4 february" or "4 feb"
-        m = re.search(rf"(\d{{1,2}})\s*(?:{re.escape(full)}|{re.escape(abbr)})\b", lowered)
-        if m:
-            day = int(m.group(1))
-            if 1 <= day <= 31:
-                try:
-                    dt = datetime(2026, month_idx, day)
-                    preferred_date = dt.strftime("%Y-%m-%d")
-                    weekday = dt.weekday()
-                except ValueError:
-                    pass
-            if preferred_date is not None:
-                break
-        # "february 4" or "feb 4"
-        if preferred_date is None:
-            m = re.search(rf"(?:{re.escape(full)}|{re.escape(abbr)})\s*(\d{{1,2}})\b", lowered)
+    for month_idx, abbr, day_month_re, month_day_re in _MONTH_DAY_PATTERNS if has_digit else ():
+        # Every month name contains its abbreviation, so no substring hit means no regex hit
+        if abbr not in lowered:
+            continue
+        days_in_month, first_weekday = _MONTH_CALENDAR[month_idx - 1]
+        # "4 february" or "4 feb", then "february 4" or "feb 4"
+        for pattern in (day_month_re, month_day_re):
+            m = pattern.search(lowered)
             if m:
                 day = int(m.group(1))
-                if 1 <= day <= 31:
-                    try:
-                        dt = datetime(2026, month_idx, day)
-                        preferred_date = dt.strftime("%Y-%m-%d")
-                        weekday = dt.weekday()
-                    except ValueError:
-                        pass
-                if preferred_date is not None:
+                if 1 <= day <= days_in_month:
+                    preferred_date = f"{_PARSE_YEAR}-{month_idx:02d}-{day:02d}"
+                    weekday = (first_weekday + day - 1) % 7
                     break
+        if preferred_date is not None:
+            break
 
     # 2) If no date found, use weekday names / abbreviations
     if preferred_date is None:
@@ -83,9 +111,7 @@ def _parse_preferred_datetime(text: str) -> Tuple[Optional[int], Optional[int],
 
     hour: Optional[float] = None
     # 10am, 2pm, 10:00, 14:00, 10 am, 2 pm
-    time_match = re.search(
-        r"(?:^|\s)(\d{1,2})\s*:?\s*(\d{2})?\s*(am|pm)?(?:\s|$|,)", lowered
-    )
+    time_match = _TIME_RE.search(lowered) if has_digit else None
     if time_match:
         h = int(time_match.group(1))
         m = int(time_match.group(2)) if time_match.group(2) else 0
@@ -98,72 +124,116 @@ def _parse_preferred_datetime(text: str) -> Tuple[Optional[int], Optional[int],
             pass
         h = min(23, max(0, h))
         hour = h + m / 60.0
-    if hour is None and re.search(r"\b(\d{1,2})\s*(am|pm)\b", lowered):
-        m = re.search(r"(\d{1,2})\s*(am|pm)", lowered)
-        if m:
-            h = int(m.group(1))
-            if m.group(2) == "pm" and h < 12:
-                h += 12
-            elif m.group(2) == "am" and h == 12:
-                h = 0
-            hour = min(23, max(0, h))
+    # Fallback for times glued to punctuation, e.g. "friday,10am"
+    m = _AMPM_WORD_RE.search(lowered) if hour is None and has_digit else None
+    if m:
+        h = int(m.group(1))
+        if m.group(2) == "pm" and h < 12:
+            h += 12
+        elif m.group(2) == "am" and h == 12:
+            h = 0
+        hour = min(23, max(0, h))
     preferred_minutes = int(hour * 60) if hour is not None else None
     return weekday, preferred_minutes, preferred_date
 
 
-def _slot_minutes(slot: "Slot") -> int:
-    """Slot time as minutes since midnight for ranking."""
-    parts = slot.time.split(":")
+def _time_minutes(time: str) -> int:
+    """HH:MM time as minutes since midnight for ranking."""
+    parts = time.split(":")
     h = int(parts[0])
     m = int(parts[1]) if len(parts) > 1 else 0
     return h * 60 + m
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class Slot:
     date: str  # ISO date YYYY-MM-DD
     time: str  # HH:MM (24h)
     timezone: str
+    # Derived once per slot; offer_slots filters and ranks every candidate by these
+    _weekday: int = field(init=False, repr=False, compare=False)
+    _minutes: int = field(init=False, repr=False, compare=False)
+    _month: int = field(init=False, repr=False, compare=False)
+    _day: int = field(init=False, repr=False, compare=False)
+    # Built on first label() call; only offered slots are ever labelled, but those repeatedly
+    _label: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        d = date.fromisoformat(self.date)
+        # Frozen: derived fields are set through object.__setattr__
+        object.__setattr__(self, "_weekday", d.weekday())
+        object.__setattr__(self, "_month", d.month)
+        object.__setattr__(self, "_day", d.day)
+        object.__setattr__(self, "_minutes", _time_minutes(self.time))
 
     def label(self) -> str:
         """Human-friendly label like 'Tuesday, Feb 10 at 2:00 PM IST'."""
-        dt = datetime.fromisoformat(f"{self.date}T{self.time}")
-        pretty_date = dt.strftime("%A, %b %d")
-        pretty_time = dt.strftime("%I:%M %p").lstrip("0")
-        return f"{pretty_date} at {pretty_time} {self.timezone}"
+        if self._label is None:
+            hour, minute = divmod(self._minutes, 60)
+            object.__setattr__(self, "_label", (
+                f"{_WEEKDAY_LABELS[self._weekday]}, {_MONTH_LABELS[self._month - 1]} {self._day:02d} "
+                f"at {(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'} {self.timezone}"
+            ))
+        return self._label
 
     def weekday(self) -> int:
         """Python weekday: Monday=0, ..., Sunday=6."""
-        return datetime.strptime(self.date, "%Y-%m-%d").weekday()
+        return self._weekday
+
+
+# (mtime of mock_calendar.json, slots parsed from it); re-read only when the file changes
+_slots_cache: Optional[Tuple[float, Tuple[Slot, ...]]] = None
 
 
-def load_slots() -> List[Slot]:
+def load_slots() -> Tuple[Slot, ...]:
     """Load slots from mock_calendar.json (fallback when real calendar not used or fails)."""
+    global _slots_cache
+    mtime = DATA_PATH.stat().st_mtime
+    if _slots_cache is not None and _slots_cache[0] == mtime:
+        # Immutable tuple of frozen slots: safe to hand the cached value to every caller
+        return _slots_cache[1]
+
     with DATA_PATH.open("r", encoding="utf-8") as f:
         data = json.load(f)
 
-    slots: List[Slot] = []
-    for entry in data.get("available_slots", []):
-        date = entry["date"]
-        tz = entry.get("timezone", "Asia/Kolkata")
-        for t in entry.get("times", []):
-            slots.append(Slot(date=date, time=t, timezone=tz))
+    slots = tuple(
+        Slot(date=entry["date"], time=t, timezone=entry.get("timezone", "Asia/Kolkata"))
+        for entry in data.get("available_slots", [])
+        for t in entry.get("times", [])
+    )
+    _slots_cache = (mtime, slots)
     return slots
 
 
-def _load_slots_from_calendar_or_mock() -> List[Slot]:
+@lru_cache(maxsize=1)
+def _google_calendar_source() -> Optional[Tuple[str, str, Optional[str], str]]:
+    """
+    (calendar_id, credentials_path, credentials_json, timezone) when Google Calendar is configured, else None.
+    Resolved once per process, like the settings it reads.
+    """
+    from src.config import get_settings
+    settings = get_settings()
+    if not (settings.google_configured() and getattr(settings, "google_calendar_id", None)):
+        return None
+    return (
+        settings.google_calendar_id,
+        getattr(settings, "google_credentials_path", "") or "",
+        getattr(settings, "google_credentials_json", None),
+        getattr(settings, "timezone", "Asia/Kolkata"),
+    )
+
+
+def _load_slots_from_calendar_or_mock() -> Sequence[Slot]:
     """Use real Google Calendar free/busy when credentials and calendar ID are set; else mock."""
     try:
-        from src.config import get_settings
-        from src.mcp.calendar_mcp import SlotInfo, get_available_slots
-        settings = get_settings()
-        if settings.google_configured() and getattr(settings, "google_calendar_id", None):
-            creds = getattr(settings, "google_credentials_path", "") or ""
-            cal_id = settings.google_calendar_id
-            tz = getattr(settings, "timezone", "Asia/Kolkata")
+        source = _google_calendar_source()
+        if source is not None:
+            from src.mcp.calendar_mcp import SlotInfo, get_available_slots
+            cal_id, creds, creds_json, tz = source
             infos: List[SlotInfo] = get_available_slots(
                 calendar_id=cal_id,
                 credentials_path=creds,
+                credentials_json=creds_json,
                 timezone=tz,
                 days_ahead=14,
                 start_hour=9,
@@ -189,22 +259,20 @@ def offer_slots(
     Filters by weekday and ranks by proximity to preferred time.
     """
     all_slots = _load_slots_from_calendar_or_mock()
-    text = preferred_datetime_text or ""
-    if preferred_date:
-        text = f"{text} {preferred_date}".strip()
-    if preferred_time:
-        text = f"{text} {preferred_time}".strip()
-    preferred_weekday, preferred_minutes, preferred_date_parsed = _parse_preferred_datetime(text)
+    # Normalize once and go straight to the memoized parser
+    lowered = " ".join(p for p in (preferred_datetime_text, preferred_date, preferred_time) if p).lower().strip()
+    if not lowered:
+        # No preference at all: the first two available slots, nothing to parse or rank
+        return list(all_slots[:2])
+    preferred_weekday, preferred_minutes, preferred_date_parsed = _parse_lowered_datetime(lowered)
 
     # Prefer explicit date (e.g. "4 Feb") over weekday — filter by that date when present
     if preferred_date_parsed is not None:
         on_date = [s for s in all_slots if s.date == preferred_date_parsed]
         if on_date:
             if preferred_minutes is not None:
-                on_date.sort(key=lambda s: abs(_slot_minutes(s) - preferred_minutes))
-            else:
-                on_date.sort(key=lambda s: s.time)
-            return on_date[:2]
+                return heapq.nsmallest(2, on_date, key=lambda s, p=preferred_minutes: abs(s._minutes - p))
+            return heapq.nsmallest(2, on_date, key=attrgetter("time"))
         # No slots on that date; return empty so agent can say "no slots on that day"
         return []
 
@@ -212,13 +280,11 @@ def offer_slots(
         on_day = [s for s in all_slots if s.weekday() == preferred_weekday]
         if on_day:
             if preferred_minutes is not None:
-                on_day.sort(key=lambda s: abs(_slot_minutes(s) - preferred_minutes))
-            else:
-                on_day.sort(key=lambda s: (s.date, s.time))
-            return on_day[:2]
+                return heapq.nsmallest(2, on_day, key=lambda s, p=preferred_minutes: abs(s._minutes - p))
+            return heapq.nsmallest(2, on_day, key=attrgetter("date", "time"))
         # Requested weekday (e.g. Monday) has no slots in the window — don't offer other days
         return []
     if preferred_minutes is not None:
-        all_slots.sort(key=lambda s: abs(_slot_minutes(s) - preferred_minutes))
-    return all_slots[:2]
+        return heapq.nsmallest(2, all_slots, key=lambda s, p=preferred_minutes: abs(s._minutes - p))
+    return list(all_slots[:2])
 
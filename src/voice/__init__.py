@@ -1,6 +1,6 @@
 """Voice I/O handlers (STT/TTS) for the Streamlit frontend."""
 
 from src.voice.stt import transcribe_audio
-from src.voice.tts import text_to_speech_mp3
+from src.voice.tts import text_to_speech_mp3, text_to_speech_mp3_stream
 
-__all__ = ["transcribe_audio", "text_to_speech_mp3"]
\ No newline at end of file
+__all__ = ["transcribe_audio", "text_to_speech_mp3", "text_to_speech_mp3_stream"]
\ No newline at end of file
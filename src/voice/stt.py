@@ -3,19 +3,30 @@
 from __future__ import annotations
 
 import io
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Union
 
+try:
+    import speech_recognition as sr
+except ImportError:  # voice input is then unavailable; transcribe_audio returns None
+    sr = None
 
-def transcribe_audio(audio_bytes: bytes) -> Optional[str]:
+
+@lru_cache(maxsize=1)
+def _recognizer():
+    """One Recognizer per process, reused for every recording."""
+    return sr.Recognizer()
+
+
+def transcribe_audio(audio_bytes: Union[bytes, memoryview]) -> Optional[str]:
     """
-    Transcribe WAV audio bytes to text using SpeechRecognition (Google Web API, free tier).
+    Transcribe WAV audio (bytes or a memoryview over them) to text using SpeechRecognition (Google Web API, free tier).
     Returns None on error or empty result.
     """
-    if not audio_bytes:
+    if not audio_bytes or sr is None:
         return None
     try:
-        import speech_recognition as sr
-        recognizer = sr.Recognizer()
+        recognizer = _recognizer()
         with sr.AudioFile(io.BytesIO(audio_bytes)) as source:
             audio = recognizer.record(source)
         text = recognizer.recognize_google(audio)
@@ -2,25 +2,97 @@
 
 from __future__ import annotations
 
-import io
-from typing import Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, List, Optional
+
+try:
+    from gtts import gTTS
+except ImportError:  # spoken replies are then unavailable; text_to_speech_mp3 returns None
+    gTTS = None
+
+# Sentence boundary: whitespace after . ! ? (so decimals like "2.5" stay whole), or a line break
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+# A chunk whose last word is one of these is not a sentence end; keep reading
+_ABBREVIATIONS = frozenset(("dr.", "mr.", "mrs.", "ms.", "e.g.", "i.e.", "a.m.", "p.m.", "etc."))
+# Shorter fragments are merged into the next one (not worth a separate TTS request)
+_MIN_SENTENCE_CHARS = 10
+
+
+def sentence_split(text: str) -> List[str]:
+    """
+    Split agent text into sentences for chunked TTS.
+    Breaks on . ! ? followed by whitespace and on line breaks; skips common abbreviations,
+    merges fragments shorter than 10 characters forward, and flushes any remainder last.
+    """
+    sentences: List[str] = []
+    pending = ""
+    for part in _SENTENCE_BREAK_RE.split((text or "").strip()):
+        part = part.strip()
+        if not part:
+            continue
+        pending = f"{pending} {part}" if pending else part
+        # Whole last word only: "terms." ends in "ms." but is a real sentence end
+        last_word = pending.rsplit(None, 1)[-1].lstrip("(\"'").lower()
+        if len(pending) >= _MIN_SENTENCE_CHARS and last_word not in _ABBREVIATIONS:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        sentences.append(pending)
+    return sentences
+
+
+def text_to_speech_mp3_stream(text: str, lang: str = "en") -> Iterator[bytes]:
+    """
+    Yield MP3 bytes segment by segment as gTTS synthesizes them (gTTS splits long text),
+    so a caller can start using audio before the whole reply is ready.
+    Yields nothing for empty text or when gTTS is not installed; API errors propagate to the caller.
+    """
+    if not text or not text.strip() or gTTS is None:
+        return
+    yield from gTTS(text=text.strip(), lang=lang).stream()
+
+
+@lru_cache(maxsize=128)
+def _synthesize_mp3(text: str, lang: str) -> bytes:
+    """
+    MP3 for one stripped text, memoized: agent prompts and sentences repeat across turns and
+    sessions, and each miss is a network round-trip. Raises on failure so failures are not cached.
+    """
+    audio = b"".join(text_to_speech_mp3_stream(text, lang=lang))
+    if not audio:
+        raise ValueError("gTTS returned no audio")
+    return audio
 
 
 def text_to_speech_mp3(text: str, lang: str = "en") -> Optional[bytes]:
     """
-    Generate MP3 bytes from text using gTTS.
+    Generate MP3 bytes from text using gTTS (cached per text and language).
     Returns None on error (e.g. empty text or API failure).
     """
-    if not text or not text.strip():
+    if not text or not text.strip() or gTTS is None:
         return None
     try:
-        from gtts import gTTS
-        buf = io.BytesIO()
-        tts = gTTS(text=text.strip(), lang=lang)
-        tts.write_to_fp(buf)
-        return buf.getvalue()
+        return _synthesize_mp3(text.strip(), lang)
     except Exception:
         return None
 
 
-__all__ = ["text_to_speech_mp3"]
+def text_to_speech_mp3_sentences(text: str, lang: str = "en", max_workers: int = 4) -> List[bytes]:
+    """
+    Synthesize each sentence of text concurrently and return the MP3 clips in order,
+    so the reply takes as long as its slowest sentence rather than the sum.
+    Returns [] if the text is empty or any sentence fails (no partial replies).
+    """
+    sentences = sentence_split(text)
+    if not sentences:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(sentences))) as pool:
+        clips = list(pool.map(lambda sentence: text_to_speech_mp3(sentence, lang=lang), sentences))
+    if not all(clips):
+        return []
+    return clips
+
+
+__all__ = ["sentence_split", "text_to_speech_mp3", "text_to_speech_mp3_sentences", "text_to_speech_mp3_stream"]
@@ -0,0 +1,48 @@
+"""Unit tests for booking code generation and parsing (typed and voice-transcribed codes)."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from src.services.booking_code import generate_booking_code, parse_booking_code
+
+
+class TestParseBookingCode:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("NL-A742", "NL-A742"),
+            ("nl-a742", "NL-A742"),
+            ("NLA742", "NL-A742"),
+            ("NL A 742", "NL-A742"),
+            ("my code is nl b 123", "NL-B123"),
+            ("N L P 7 6 0", "NL-P760"),
+            ("n.l.-p.7.6.0", "NL-P760"),
+            ("NL_P 76 0, thanks", "NL-P760"),
+        ],
+    )
+    def test_finds_and_canonicalizes(self, text: str, expected: str) -> None:
+        assert parse_booking_code(text) == expected
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            "hello",
+            "NL-A74",  # too few digits
+            "NL-A7420",  # too many digits
+            "NL-A042",  # codes never start their number with 0
+            "XNL-A742",  # prefix inside another word
+            "NL-742",  # no letter
+        ],
+    )
+    def test_rejects_non_codes(self, text: str) -> None:
+        assert parse_booking_code(text) is None
+
+    def test_round_trips_generated_codes(self) -> None:
+        for _ in range(50):
+            code = generate_booking_code()
+            assert re.fullmatch(r"NL-[A-Z][1-9][0-9]{2}", code)
+            assert parse_booking_code(code) == code
@@ -0,0 +1,95 @@
+"""Unit tests for the calendar MCP adapter: busy-range merging and the free-slot sweep."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock, patch
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from src.mcp.calendar_mcp import _merge_busy_ranges, get_available_slots
+
+_TZ = ZoneInfo("Asia/Kolkata")
+# A Wednesday a week or so out: always inside the default 14-day window and never "before now"
+_DAY = date.today() + timedelta(days=7 + (2 - date.today().weekday()) % 7)
+_ALL_SLOTS = ["09:00", "09:30", "10:00", "10:30", "11:00", "11:30"]
+
+
+def _at(hh_mm: str) -> datetime:
+    hour, minute = (int(part) for part in hh_mm.split(":"))
+    return datetime(_DAY.year, _DAY.month, _DAY.day, hour, minute, tzinfo=_TZ)
+
+
+def _lend(service: MagicMock) -> MagicMock:
+    """Stand-in for borrow_service that lends the given mock service."""
+    borrow = MagicMock()
+    borrow.return_value.__enter__.return_value = service
+    return borrow
+
+
+def _free_slots(busy: list[tuple[str, str]]) -> list[str]:
+    """Run get_available_slots over _DAY (09:00–12:00) against a mocked freebusy response."""
+    service = MagicMock()
+    service.freebusy.return_value.query.return_value.execute.return_value = {
+        "calendars": {"cal": {"busy": [{"start": _at(s).isoformat(), "end": _at(e).isoformat()} for s, e in busy]}}
+    }
+    with patch("src.mcp.calendar_mcp._get_credentials", return_value=object()), \
+            patch("src.mcp.calendar_mcp.borrow_service", _lend(service)):
+        slots = get_available_slots("cal", "creds.json", start_hour=9, end_hour=12)
+    return [slot.time for slot in slots if slot.date == _DAY.isoformat()]
+
+
+class TestMergeBusyRanges:
+    def test_overlapping_ranges_merge(self) -> None:
+        merged = _merge_busy_ranges([(_at("09:10"), _at("09:40")), (_at("09:35"), _at("10:05"))])
+        assert merged == [(_at("09:10"), _at("10:05"))]
+
+    def test_adjacent_ranges_merge(self) -> None:
+        merged = _merge_busy_ranges([(_at("09:00"), _at("09:30")), (_at("09:30"), _at("10:00"))])
+        assert merged == [(_at("09:00"), _at("10:00"))]
+
+    def test_nested_range_is_absorbed(self) -> None:
+        merged = _merge_busy_ranges([(_at("09:00"), _at("11:00")), (_at("09:30"), _at("09:45"))])
+        assert merged == [(_at("09:00"), _at("11:00"))]
+
+    def test_out_of_order_ranges_are_sorted(self) -> None:
+        merged = _merge_busy_ranges([(_at("11:00"), _at("11:30")), (_at("09:00"), _at("09:30"))])
+        assert merged == [(_at("09:00"), _at("09:30")), (_at("11:00"), _at("11:30"))]
+
+    def test_empty(self) -> None:
+        assert _merge_busy_ranges([]) == []
+
+
+class TestGetAvailableSlotsSweep:
+    @pytest.mark.parametrize(
+        "busy, expected",
+        [
+            ([], _ALL_SLOTS),
+            # overlapping: 09:10–10:05 blocks the 09:00, 09:30 and 10:00 slots
+            ([("09:10", "09:40"), ("09:35", "10:05")], ["10:30", "11:00", "11:30"]),
+            # adjacent: 09:00–10:00
+            ([("09:00", "09:30"), ("09:30", "10:00")], ["10:00", "10:30", "11:00", "11:30"]),
+            # nested: the inner range changes nothing
+            ([("09:00", "11:00"), ("09:30", "09:45")], ["11:00", "11:30"]),
+            # out of order
+            ([("11:00", "11:30"), ("09:00", "09:30")], ["09:30", "10:00", "10:30", "11:30"]),
+            # a range ending exactly at a slot start leaves that slot free
+            ([("10:00", "10:30")], ["09:00", "09:30", "10:30", "11:00", "11:30"]),
+        ],
+    )
+    def test_free_slots(self, busy: list[tuple[str, str]], expected: list[str]) -> None:
+        assert _free_slots(busy) == expected
+
+    def test_utc_busy_times_are_converted(self) -> None:
+        service = MagicMock()
+        start = _at("09:30").astimezone(ZoneInfo("UTC")).strftime("%Y-%m-%dT%H:%M:%SZ")
+        end = _at("10:00").astimezone(ZoneInfo("UTC")).strftime("%Y-%m-%dT%H:%M:%SZ")
+        service.freebusy.return_value.query.return_value.execute.return_value = {
+            "calendars": {"cal": {"busy": [{"start": start, "end": end}]}}
+        }
+        with patch("src.mcp.calendar_mcp._get_credentials", return_value=object()), \
+                patch("src.mcp.calendar_mcp.borrow_service", _lend(service)):
+            slots = get_available_slots("cal", "creds.json", start_hour=9, end_hour=12)
+        times = [slot.time for slot in slots if slot.date == _DAY.isoformat()]
+        assert times == ["09:00", "10:00", "10:30", "11:00", "11:30"]
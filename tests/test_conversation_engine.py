@@ -101,6 +101,27 @@ class TestBookNewFlowTextInput:
         session.step("confirm")
         assert session.state == ConversationState.BOOKING_COMPLETE
 
+    def test_slot_choice_second_one_is_not_first(self) -> None:
+        session = ConversationSession(timezone_label="IST")
+        _run_steps(
+            session,
+            ["", "yes", "book new", "KYC onboarding", "Tuesday 2pm"],
+        )
+        session.step("the second one")
+        assert session.context.chosen_slot_index == 1
+
+    def test_confirmation_words_match_whole_words(self) -> None:
+        session = ConversationSession(timezone_label="IST")
+        _run_steps(
+            session,
+            ["", "yes", "book new", "KYC onboarding", "Tuesday 2pm", "first"],
+        )
+        # "know" must not be read as "no"
+        session.step("I know")
+        assert session.state == ConversationState.CONFIRMATION
+        session.step("okay")
+        assert session.state == ConversationState.BOOKING_COMPLETE
+
     def test_slot_none_goes_to_waitlist(self) -> None:
         session = ConversationSession(timezone_label="IST")
         _run_steps(
@@ -173,6 +194,42 @@ class TestCancelFlow:
         session.step("no")
         assert session.state == ConversationState.INTENT_CONFIRMATION
 
+    def test_dont_cancel_is_not_a_yes(self) -> None:
+        session = ConversationSession(timezone_label="IST")
+        _run_steps(session, ["", "yes", "cancel", "NL-B123"])
+        session.step("don't cancel it")
+        assert session.state == ConversationState.CANCEL_CONFIRM
+        session.step("Yes.")
+        assert session.state == ConversationState.BOOKING_COMPLETE
+
+    def test_inflected_cancel_is_not_a_new_booking(self) -> None:
+        session = ConversationSession(timezone_label="IST")
+        _run_steps(session, ["", "yes"])
+        session.step("I'm cancelling my booking")
+        assert session.state == ConversationState.CANCEL_ASK_CODE
+        session.step("NL-B123")
+        session.step("cancelling it")
+        assert session.state == ConversationState.BOOKING_COMPLETE
+
+    def test_inflected_reschedule_is_not_a_new_booking(self) -> None:
+        session = ConversationSession(timezone_label="IST")
+        _run_steps(session, ["", "yes"])
+        session.step("I want my booking rescheduled")
+        assert session.state == ConversationState.RESCHEDULE_ASK_CODE
+
+    def test_cancel_code_is_validated_and_canonicalized(self) -> None:
+        session = ConversationSession(timezone_label="IST")
+        session.step("")
+        session.step("yes")
+        session.step("cancel")
+        t = session.step("hello")
+        assert session.state == ConversationState.CANCEL_ASK_CODE
+        assert "NL-A742" in t.text
+        # Voice-style transcription of a code
+        session.step("my code is nl b 123")
+        assert session.context.existing_booking_code == "NL-B123"
+        assert session.state == ConversationState.CANCEL_CONFIRM
+
 
 class TestDisclaimerAndIntentClarification:
     """Disclaimer rejection and unclear intent."""
@@ -0,0 +1,110 @@
+"""Unit tests for the sheets MCP adapter's booking-row lookup against a mocked Sheets service."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.mcp import sheets_mcp
+from src.mcp.sheets_mcp import _find_booking_row, _tag_booking_row
+
+_SHEET = "sheet-1"
+
+
+def _service(
+    column_b: List[str],
+    tagged_rows: Optional[List[int]] = None,
+    tabs: Optional[Dict[str, int]] = None,
+) -> MagicMock:
+    """Mock Sheets service whose first tab has the given column B (row 1 first) and row metadata tags."""
+    service = MagicMock()
+    spreadsheets = service.spreadsheets.return_value
+
+    def values_get(spreadsheetId: str, range: str, majorDimension: str = "ROWS") -> MagicMock:
+        if range == "B:B":
+            payload = {"values": [column_b]} if column_b else {}
+        else:
+            row = int(range[1:])
+            payload = {"values": [[column_b[row - 1]]]} if row <= len(column_b) and column_b[row - 1] else {}
+        return MagicMock(execute=MagicMock(return_value=payload))
+
+    spreadsheets.values.return_value.get.side_effect = values_get
+    spreadsheets.developerMetadata.return_value.search.return_value.execute.return_value = {
+        "matchedDeveloperMetadata": [
+            {"developerMetadata": {"location": {"dimensionRange": {"sheetId": 0, "startIndex": row - 1}}}}
+            for row in tagged_rows or []
+        ]
+    }
+    spreadsheets.get.return_value.execute.return_value = {
+        "sheets": [{"properties": {"title": title, "sheetId": tab_id}} for title, tab_id in (tabs or {}).items()]
+    }
+    return service
+
+
+def _requested_ranges(service: MagicMock) -> List[str]:
+    return [c.kwargs["range"] for c in service.spreadsheets.return_value.values.return_value.get.call_args_list]
+
+
+@pytest.fixture(autouse=True)
+def _empty_index():
+    sheets_mcp._row_index.clear()
+    sheets_mcp._tab_ids.clear()
+    yield
+    sheets_mcp._row_index.clear()
+    sheets_mcp._tab_ids.clear()
+
+
+class TestFindBookingRow:
+    def test_cache_hit_checks_only_the_cached_cell(self) -> None:
+        service = _service(["booking_code", "NL-A111", "NL-B222"])
+        sheets_mcp._row_index[(_SHEET, "NLB222")] = 3
+        assert _find_booking_row(service, _SHEET, "nl b 222") == 3
+        assert _requested_ranges(service) == ["B3"]
+        service.spreadsheets.return_value.developerMetadata.assert_not_called()
+
+    def test_stale_cache_falls_back_to_full_rebuild(self) -> None:
+        service = _service(["booking_code", "NL-B222", "NL-C333"])
+        sheets_mcp._row_index[(_SHEET, "NLB222")] = 3  # row moved up by a hand edit
+        assert _find_booking_row(service, _SHEET, "NL-B222") == 2
+        assert _requested_ranges(service) == ["B3", "B:B"]
+        assert sheets_mcp._row_index[(_SHEET, "NLB222")] == 2
+
+    def test_metadata_hit_is_verified_against_column_b(self) -> None:
+        service = _service(["booking_code", "NL-A111", "NL-B222"], tagged_rows=[3])
+        assert _find_booking_row(service, _SHEET, "NL-B222") == 3
+        assert _requested_ranges(service) == ["B3"]
+        assert sheets_mcp._row_index[(_SHEET, "NLB222")] == 3
+
+    def test_unverified_metadata_hit_is_ignored(self) -> None:
+        # The tag points at row 2 (e.g. it sits on another tab), but column B there holds another code
+        service = _service(["booking_code", "NL-A111", "NL-B222"], tagged_rows=[2])
+        assert _find_booking_row(service, _SHEET, "NL-B222") == 3
+        assert _requested_ranges(service) == ["B2", "B:B"]
+
+    def test_full_rebuild_finds_untagged_row(self) -> None:
+        service = _service(["booking_code", "NL-A111", "", "nl b 222"])
+        assert _find_booking_row(service, _SHEET, "NL-B222") == 4
+        assert _requested_ranges(service) == ["B:B"]
+        assert sheets_mcp._row_index[(_SHEET, "NLA111")] == 2
+
+    def test_missing_code(self) -> None:
+        service = _service(["booking_code", "NL-A111"])
+        assert _find_booking_row(service, _SHEET, "NL-Z999") is None
+
+
+class TestTagBookingRow:
+    def test_tags_row_on_resolved_tab(self) -> None:
+        service = _service([], tabs={"Sheet1": 0, "Bookings": 42})
+        _tag_booking_row(service, _SHEET, "Bookings", 5, "NLB222")
+        body = service.spreadsheets.return_value.batchUpdate.call_args.kwargs["body"]
+        metadata = body["requests"][0]["createDeveloperMetadata"]["developerMetadata"]
+        assert metadata["location"]["dimensionRange"] == {
+            "sheetId": 42, "dimension": "ROWS", "startIndex": 4, "endIndex": 5,
+        }
+
+    def test_skips_tagging_when_tab_is_unresolved(self) -> None:
+        service = _service([], tabs={"Sheet1": 0})
+        _tag_booking_row(service, _SHEET, "Renamed", 5, "NLB222")
+        service.spreadsheets.return_value.batchUpdate.assert_not_called()
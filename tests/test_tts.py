@@ -0,0 +1,48 @@
+"""Unit tests for TTS sentence splitting (chunked playback of agent replies)."""
+
+from __future__ import annotations
+
+from src.voice.tts import sentence_split
+
+
+class TestSentenceSplit:
+    def test_splits_on_sentence_punctuation(self) -> None:
+        text = "Your slot is booked. Do you need anything else? Have a great day!"
+        assert sentence_split(text) == ["Your slot is booked.", "Do you need anything else?", "Have a great day!"]
+
+    def test_splits_on_line_breaks(self) -> None:
+        assert sentence_split("Option one: Tuesday 10:00\nOption two: Friday 14:30") == [
+            "Option one: Tuesday 10:00",
+            "Option two: Friday 14:30",
+        ]
+
+    def test_decimals_stay_whole(self) -> None:
+        assert sentence_split("Expect about 2.5 days for payout.") == ["Expect about 2.5 days for payout."]
+
+    def test_abbreviations_do_not_end_a_sentence(self) -> None:
+        assert sentence_split("Your advisor is Dr. Rao. See you at 10 a.m. on Friday.") == [
+            "Your advisor is Dr. Rao.",
+            "See you at 10 a.m. on Friday.",
+        ]
+
+    def test_word_ending_like_an_abbreviation_ends_a_sentence(self) -> None:
+        # "terms." ends in "ms." but is a whole word, not the abbreviation
+        assert sentence_split("Please review the terms. Then confirm the slot.") == [
+            "Please review the terms.",
+            "Then confirm the slot.",
+        ]
+
+    def test_parenthesized_abbreviation(self) -> None:
+        assert sentence_split("Bring documents (e.g. PAN card) to the meeting.") == [
+            "Bring documents (e.g. PAN card) to the meeting.",
+        ]
+
+    def test_short_fragments_merge_forward(self) -> None:
+        assert sentence_split("Okay. Your booking code is NL-A742.") == ["Okay. Your booking code is NL-A742."]
+
+    def test_short_remainder_is_flushed(self) -> None:
+        assert sentence_split("Your slot is booked. Bye.") == ["Your slot is booked.", "Bye."]
+
+    def test_empty(self) -> None:
+        assert sentence_split("") == []
+        assert sentence_split("   ") == []